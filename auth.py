@@ -0,0 +1,77 @@
+"""Şifre hash'leme servisi.
+
+PBKDF2 (100.000 tur) olay döngüsünü bloklamasın diye hash'leme ve doğrulama
+işleri süreç havuzunda çalıştırılır. Aynı anda en fazla MAX_WORKERS iş
+havuza verilir, bekleyen iş sayısı MAX_PENDING'i aşarsa yeni istekler
+AuthBusyError ile reddedilir (admission control). MAX_PENDING'in alt sınırı
+tek çekirdekli sunucularda küçük bir giriş/kayıt dalgasının reddedilmemesi
+içindir; bekleyen işler sadece sırasını bekler, olay döngüsünü yormaz.
+Kuyrukta beklemek Discord'un 3 saniyelik onay süresini aşabileceği için
+giriş/kayıt modalları hash'ten önce defer() ile onay verir.
+"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from main import hash_password as _hash_password, verify_password as _verify_password
+from metrics import metrics
+
+MAX_WORKERS = int(os.environ.get("AUTH_WORKERS", os.cpu_count() or 2))
+MIN_PENDING = 32
+MAX_PENDING = int(os.environ.get("AUTH_MAX_PENDING", max(MIN_PENDING, MAX_WORKERS * 8)))
+
+_executor = None
+_slots = None
+_pending = 0
+
+
+class AuthBusyError(Exception):
+    """Hash kuyruğu dolu; istek kabul edilmedi."""
+
+
+def _get_executor():
+    global _executor, _slots
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+        _slots = asyncio.Semaphore(MAX_WORKERS)
+    return _executor
+
+
+async def _run(op, func, *args):
+    global _pending
+    if _pending >= MAX_PENDING:
+        metrics.inc("auth_rejected_total", op=op)
+        raise AuthBusyError("Şifre doğrulama kuyruğu dolu")
+    executor = _get_executor()
+    _pending += 1
+    try:
+        # Havuzun iç kuyruğu büyümesin diye en fazla MAX_WORKERS iş gönderilir
+        async with _slots:
+            loop = asyncio.get_running_loop()
+            with metrics.timer("auth_hash_seconds", op=op):
+                return await loop.run_in_executor(executor, func, *args)
+    finally:
+        _pending -= 1
+
+
+async def hash_password(password):
+    """Şifreyi süreç havuzunda hash'le"""
+    return await _run("hash", _hash_password, password)
+
+
+async def verify_password(stored_password, provided_password):
+    """Hash'lenmiş şifreyi süreç havuzunda doğrula"""
+    return await _run("verify", _verify_password, stored_password, provided_password)
+
+
+def pending():
+    """Kuyrukta bekleyen ve çalışan iş sayısı"""
+    return _pending
+
+
+def shutdown():
+    global _executor, _slots
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        _slots = None
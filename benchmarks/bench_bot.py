@@ -0,0 +1,253 @@
+"""bot2 için ağsız yük testi.
+
+Sentetik kullanıcılar sahte bir Discord üzerinden tam akışı çalıştırır:
+!giris, kayıt ve giriş modalları, quiz (tüm sorular), leaderboard, profil,
+hedef oluşturma (ertesi gün bitişli; hatırlatma döngüsü ve DM kuyruğu
+çalışır) ve hedef listeleme. Her adımın cevabı kontrol edilir; beklenen
+cevap gelmezse (ör. "Sistem şu anda yoğun", giriş reddi) adım hata sayılır
+ve giriş başarısızsa kullanıcının senaryosu orada biter. Her işlem için
+p50/p99 gecikme, toplam throughput, olay döngüsü gecikmesi ve bellek
+artışı raporlanır.
+
+Kullanım (depo kökünden):
+    python benchmarks/bench_bot.py --users 200 --concurrency 50 --rounds 3
+
+Veritabanı geçici bir dizinde oluşturulur ve sonunda silinir; aynı --seed
+ile aynı iş yükü üretilir.
+"""
+import argparse
+import asyncio
+import datetime
+import gc
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_discord import FakeAPI, FakeContext, FakeGateway, FakeGuild, FakeInteraction
+
+LAG_INTERVAL = 0.01  # saniye
+REPLY_TIMEOUT = 30   # ertelenmiş etkileşimlerin followup'ı için en fazla bekleme (saniye)
+
+
+class UnexpectedReply(Exception):
+    pass
+
+
+def expect(messages, text):
+    """İlk cevap text'i içermiyorsa UnexpectedReply; text None ise embed beklenir"""
+    content, kwargs = messages[0] if messages else (None, {})
+    ok = "embed" in kwargs if text is None else bool(content) and text in content
+    if not ok:
+        raise UnexpectedReply(f"beklenmeyen cevap: {content!r}")
+
+
+async def reply(interaction):
+    """Etkileşimin ilk cevabını bekler (defer edilenlerde followup sonradan gelir)"""
+    deadline = time.monotonic() + REPLY_TIMEOUT
+    while not interaction.messages and interaction.modal is None:
+        if time.monotonic() > deadline:
+            raise UnexpectedReply("cevap gelmedi")
+        await asyncio.sleep(0.001)
+    return interaction
+
+
+def rss_kb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * (os.sysconf("SC_PAGE_SIZE") // 1024)
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {}  # işlem -> [saniye]
+        self.errors = {}
+
+    async def timed(self, name, coro):
+        """Adımı ölçer; hata ya da beklenmeyen cevapta False döner"""
+        started = time.perf_counter()
+        try:
+            await coro
+            return True
+        except Exception as e:
+            self.errors[name] = self.errors.get(name, 0) + 1
+            if self.errors[name] == 1:
+                print(f"{name} hatası: {e!r}")
+            return False
+        finally:
+            self.latencies.setdefault(name, []).append(time.perf_counter() - started)
+
+    def total(self):
+        return sum(len(v) for v in self.latencies.values())
+
+
+async def loop_lag(samples, stop):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append(time.perf_counter() - started - LAG_INTERVAL)
+
+
+class Scenario:
+    def __init__(self, bot2, rec, rng):
+        self.bot2 = bot2
+        self.rec = rec
+        self.rng = rng
+
+    async def command(self, member, name, *args, expected="", **kwargs):
+        """expected: cevapta geçmesi gereken metin (None: embed)"""
+        command = self.bot2.bot.get_command(name)
+        ctx = FakeContext(member, command)
+        if await self.bot2.global_check(ctx):
+            await command.callback(ctx, *args, **kwargs)
+        expect(ctx.messages, expected)
+        return ctx
+
+    async def click(self, member, custom_id):
+        interaction = FakeInteraction(member, custom_id)
+        await self.bot2.router.dispatch(interaction)
+        return await reply(interaction)
+
+    async def submit(self, member, custom_id, expected, **fields):
+        interaction = await self.click(member, custom_id)
+        modal = interaction.modal
+        if modal is None:
+            raise UnexpectedReply(f"modal açılmadı: {interaction.messages[:1]!r}")
+        for name, value in fields.items():
+            getattr(modal, name)._value = value
+        await modal.on_submit(interaction)
+        expect(interaction.messages, expected)
+
+    async def quiz(self, member, kategori):
+        quiz = self.bot2.quizzes.get(kategori)
+        await self.command(member, "quiz", kategori, expected="quizi başlıyor")
+        for soru_no in range(1, len(quiz) + 1):
+            choice = self.rng.choice(quiz.views[soru_no].children)
+            interaction = await self.click(member, choice.custom_id)
+            expect(interaction.messages, "Quiz tamamlandı!" if soru_no == len(quiz) else quiz.prompt(soru_no + 1))
+
+    async def run_user(self, member, first_round):
+        rec = self.rec
+        username, password = f"bench{member.id}", "sifre1234"
+        await rec.timed("giris", self.command(member, "giris", expected="giriş yapın"))
+        if first_round:
+            await rec.timed("register", self.submit(member, "register", "Başarıyla kayıt oldunuz",
+                                                    username=username, password=password,
+                                                    email=f"{username}@example.com"))
+        if not await rec.timed("login", self.submit(member, "login", "Başarıyla giriş yaptınız",
+                                                    username=username, password=password)):
+            return  # girişsiz diğer komutlar yalnızca reddedilir; ölçümü bozmasın
+        await rec.timed("quiz", self.quiz(member, self.rng.choice(list(self.bot2.quizzes.quizzes))))
+        await rec.timed("leaderboard", self.command(member, "leaderboard", expected="Leaderboard"))
+        await rec.timed("profil", self.command(member, "profil", expected=None))
+        due = (datetime.date.today() + datetime.timedelta(days=1)).isoformat()
+        await rec.timed("set_goal", self.command(member, "set_goal", args=f"Hedef {self.rng.randrange(1000)} | {due}",
+                                                 expected="Hedef kaydedildi"))
+        await rec.timed("list_goals", self.command(member, "list_goals", expected="Hedefleriniz"))
+
+
+async def bench(args):
+    import auth
+    import bot2
+
+    rng = random.Random(args.seed)
+    api = FakeAPI(args.latency / 1000)
+    gateway = FakeGateway(bot2.bot, api)
+    guild = FakeGuild(api)
+    members = [gateway.add_member(guild, 1000 + i, f"kullanici{i}") for i in range(args.users)]
+
+    await bot2.setup_hook()
+    await bot2.on_guild_available(guild)  # gateway'de sunucu hazır olunca gelen olay
+    rec = Recorder()
+    scenario = Scenario(bot2, rec, rng)
+    sem = asyncio.Semaphore(args.concurrency)
+
+    async def one(member, first_round):
+        async with sem:
+            await scenario.run_user(member, first_round)
+
+    lag, stop = [], asyncio.Event()
+    lag_task = asyncio.create_task(loop_lag(lag, stop))
+    gc.collect()
+    rss_start = rss_kb()
+    started = time.perf_counter()
+    for round_no in range(args.rounds):
+        await asyncio.gather(*(one(m, round_no == 0) for m in members))
+        print(f"Tur {round_no + 1}/{args.rounds}: {rec.total()} işlem, RSS {rss_kb() // 1024} MB")
+    # Ertelenmiş etkileşimlerin ve hatırlatma DM'lerinin kuyruktan çıkmasını bekle
+    await asyncio.wait_for(bot2.jobs.join(), 30)
+    deadline = time.monotonic() + 30
+    while (bot2.dispatcher.depth() or bot2.dispatcher._pending) and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    rss_end = rss_kb()
+    stop.set()
+    await lag_task
+
+    print()
+    print(f"Kullanıcı: {args.users}, eşzamanlılık: {args.concurrency}, tur: {args.rounds}, "
+          f"API gecikmesi: {args.latency} ms, auth: {auth.MAX_WORKERS} işçi / {auth.MAX_PENDING} bekleyen")
+    print(f"Toplam: {rec.total()} işlem, {elapsed:.2f} s, {rec.total() / elapsed:.1f} işlem/s")
+    print(f"{'işlem':<12}{'adet':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}{'hata':>7}")
+    for name, values in rec.latencies.items():
+        print(f"{name:<12}{len(values):>8}{percentile(values, 50) * 1000:>10.2f}"
+              f"{percentile(values, 99) * 1000:>10.2f}{max(values) * 1000:>10.2f}{rec.errors.get(name, 0):>7}")
+    print(f"Olay döngüsü gecikmesi: p50 {percentile(lag, 50) * 1000:.2f} ms, "
+          f"p99 {percentile(lag, 99) * 1000:.2f} ms, max {max(lag, default=0) * 1000:.2f} ms")
+    print(f"Bellek (RSS): {rss_start // 1024} MB -> {rss_end // 1024} MB ({(rss_end - rss_start) / 1024:+.1f} MB)")
+    print(f"DM: {bot2.dispatcher.stats}")
+    print(f"API çağrıları: {api.calls}")
+    print("Router: " + ", ".join(f"{name} {n} çağrı / {total / n * 1000:.2f} ms ort."
+                                  for name, (n, total, longest) in bot2.router.stats.items()))
+
+    bot2.session_sweep.cancel()
+    bot2.mentor_sweep.cancel()
+    bot2.reminders.stop()
+    bot2.dispatcher.stop()
+    bot2.jobs.stop()
+    bot2.lag_monitor.stop()
+    await bot2.state.stop()
+    bot2.db.close()
+    auth.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=25)
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=20.0, help="simüle edilen API gecikmesi (ms)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bot-bench-")
+    os.environ["BOT_DB_PATH"] = os.path.join(workdir, "bench.db")
+    os.environ.setdefault("METRICS_PORT", "0")
+    # Her kullanıcının aynı anda en fazla bir şifre işi olur; kabul sınırı eşzamanlılığın
+    # altında kalırsa ölçülen şey bot değil AuthBusy reddi olur
+    os.environ.setdefault("AUTH_MAX_PENDING", str(max(32, args.concurrency * 2)))
+    try:
+        asyncio.run(bench(args))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
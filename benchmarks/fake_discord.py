@@ -0,0 +1,185 @@
+"""Benchmark için ağsız Discord taklidi.
+
+bot2'deki komut ve etkileşim handler'larının kullandığı kadar Discord
+nesnesi taklit edilir (kullanıcı, üye, sunucu, rol, context, interaction).
+API çağrıları (mesaj, DM, rol oluşturma/verme) gerçek ağ yerine
+`latency` kadar bekler ve sayılır. FakeGateway botun kullanıcı arama ve
+hazır olma bekleme metodlarını bu nesnelere yönlendirir.
+"""
+import asyncio
+import itertools
+
+import discord
+
+_ids = itertools.count(10**17)
+
+
+class FakeAPI:
+    """Simüle edilen REST çağrıları: gecikme ve çağrı sayıları"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = {}
+
+    async def call(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+
+class FakeRole:
+    def __init__(self, guild, name):
+        self.id = next(_ids)
+        self.guild = guild
+        self.name = name
+
+    def __repr__(self):
+        return f"<FakeRole {self.name}>"
+
+
+class FakeUser:
+    def __init__(self, api, user_id, name):
+        self.api = api
+        self.id = user_id
+        self.name = name
+        self.global_name = None
+        self.display_name = name
+        self.dms = 0
+
+    async def send(self, content=None, **kwargs):
+        await self.api.call("dm")
+        self.dms += 1
+
+
+class FakeMember(FakeUser):
+    def __init__(self, api, guild, user_id, name):
+        super().__init__(api, user_id, name)
+        self.guild = guild
+        self.nick = None
+        self.roles = []
+
+    async def add_roles(self, *roles):
+        await self.api.call("add_roles")
+        self.roles.extend(role for role in roles if role not in self.roles)
+
+
+class FakeGuild:
+    def __init__(self, api, guild_id=None):
+        self.api = api
+        self.id = guild_id or next(_ids)
+        self.roles = [FakeRole(self, "@everyone")]
+        self._members = {}
+
+    @property
+    def members(self):
+        return list(self._members.values())
+
+    def add_member(self, user_id, name):
+        member = self._members[user_id] = FakeMember(self.api, self, user_id, name)
+        return member
+
+    def get_member(self, user_id):
+        return self._members.get(user_id)
+
+    async def create_role(self, name):
+        await self.api.call("create_role")
+        role = FakeRole(self, name)
+        self.roles.append(role)
+        return role
+
+
+class FakeResponse:
+    def __init__(self, interaction):
+        self.interaction = interaction
+        self._done = False
+
+    def is_done(self):
+        return self._done
+
+    async def send_message(self, content=None, **kwargs):
+        self._done = True
+        self.interaction.messages.append((content, kwargs))
+        await self.interaction.api.call("interaction_response")
+
+    async def send_modal(self, modal):
+        self._done = True
+        self.interaction.modal = modal
+        await self.interaction.api.call("interaction_response")
+
+    async def edit_message(self, content=None, **kwargs):
+        self._done = True
+        self.interaction.messages.append((content, kwargs))
+        await self.interaction.api.call("interaction_response")
+
+    async def defer(self, **kwargs):
+        self._done = True
+        await self.interaction.api.call("interaction_response")
+
+
+class FakeFollowup:
+    def __init__(self, interaction):
+        self.interaction = interaction
+
+    async def send(self, content=None, **kwargs):
+        self.interaction.messages.append((content, kwargs))
+        await self.interaction.api.call("followup")
+
+
+class FakeInteraction:
+    type = discord.InteractionType.component
+
+    def __init__(self, member, custom_id=None):
+        self.api = member.api
+        self.user = member
+        self.guild = member.guild
+        self.guild_id = member.guild.id
+        self.data = {"custom_id": custom_id} if custom_id else {}
+        self.messages = []
+        self.modal = None
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup(self)
+
+
+class FakeContext:
+    def __init__(self, member, command):
+        self.api = member.api
+        self.author = member
+        self.guild = member.guild
+        self.command = command
+        self.messages = []
+
+    async def send(self, content=None, **kwargs):
+        self.messages.append((content, kwargs))
+        await self.api.call("message")
+
+
+class FakeGateway:
+    """Botu sahte kullanıcılara bağlar; hiçbir istek ağa çıkmaz"""
+
+    def __init__(self, bot, api):
+        self.bot = bot
+        self.api = api
+        self.users = {}
+        bot.get_user = self.users.get
+        bot.fetch_user = self._fetch_user
+        bot.wait_until_ready = self._ready
+
+    async def _ready(self):
+        return None
+
+    async def _fetch_user(self, user_id):
+        await self.api.call("fetch_user")
+        user = self.users.get(user_id)
+        if user is None:
+            raise discord.NotFound(_FakeHTTPResponse(404), "Unknown User")
+        return user
+
+    def add_member(self, guild, user_id, name):
+        member = self.users[user_id] = guild.add_member(user_id, name)
+        return member
+
+
+class _FakeHTTPResponse:
+    def __init__(self, status):
+        self.status = status
+        self.reason = "Fake"
@@ -60,8 +60,12 @@ async def on_interaction(interaction: discord.Interaction):
 
     # Quiz için cevaplar
     if cid.startswith("q1_") or cid.startswith("q2_") or cid.startswith("q3_"):
-        if user_id not in cevaplar:
+        # Her quiz 1. sorudan yeniden başlar; önceki denemenin cevapları karışmaz
+        if cid.startswith("q1_"):
             cevaplar[user_id] = []
+        elif user_id not in cevaplar:
+            await interaction.response.send_message("Quiz oturumunuz bulunamadı. `!quiz` ile yeniden başlayın.", ephemeral=True)
+            return
         cevaplar[user_id].append(cid)
 
         if cid.startswith("q1_"):
@@ -69,7 +73,7 @@ async def on_interaction(interaction: discord.Interaction):
         elif cid.startswith("q2_"):
             await interaction.response.send_message("**3. Soru:** Kariyer hedefiniz nedir?", view=QuizView(3), ephemeral=True)
         elif cid.startswith("q3_"):
-            sonuc = cevaplar[user_id]
+            sonuc = cevaplar.pop(user_id)
             if "q1_a" in sonuc:
                 dil = "İleri Seviye"; uni = "Boğaziçi Üniversitesi,yurtdışı üniversiteleri "
             elif "q1_b" in sonuc:
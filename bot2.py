@@ -1,59 +1,64 @@
 import discord
 from discord.ext import commands, tasks
 from discord.ui import Button, View, Modal, TextInput
+import asyncio
 import sqlite3
-import hashlib
-import os
 import datetime
-from collections import defaultdict
+import heapq
+import io
+import time
+
+import auth
+from dispatch import DMDispatcher
+from friends import FriendGraph
+from goals import GoalStore
+from jobs import JobQueue
+from members import MemberIndex
+import migrations
+from mentorship import DEFAULT_CAPACITY, MentorMatcher
+from paginator import Paginator
+from leaderboard import Leaderboard
+from metrics import LagMonitor, metrics
+from persistence import StateStore
+from quiz_analytics import FIELD_NAMES, QuizAnalytics
+from quiz_engine import QuizEngine
+from quiz_history import QuizHistory
+from quiz_sessions import QuizSessions
+from reminders import ReminderScheduler
+from resources import ResourceCatalog
+from roles import RoleCache
+from router import Router
+from sessions import SessionStore
+import sharding
+from sharding import ChangeFeed
+from storage import db
 
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
-bot = commands.Bot(command_prefix="!", intents=intents)
-
-
-def get_db_connection():
-    conn = sqlite3.connect('bot_users.db')
-    conn.row_factory = sqlite3.Row
-    return conn
-
-def setup_database():
-    conn = get_db_connection()
-    conn.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT UNIQUE NOT NULL,
-            password BLOB NOT NULL,
-            email TEXT,
-            discord_id INTEGER,
-            quiz_results TEXT,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    conn.commit()
-    conn.close()
+bot = sharding.make_bot(command_prefix="!", intents=intents)  # BOT_SHARDED=1 ise AutoShardedBot
+
+
+async def setup_database():
+    applied = await db.write(migrations.migrate)
+    if applied:
+        print(f"Veritabanı göçleri uygulandı: {applied}")
     print("Veritabanı kurulumu tamamlandı.")
 
-def hash_password(password):
-    salt = os.urandom(32)
-    key = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, 100000)
-    return salt + key
+def _bind_discord_id(conn, username, discord_id):
+    # discord_id benzersiz; hesap başka bir kayda bağlıysa o bağ kaldırılır
+    conn.execute('UPDATE users SET discord_id = NULL WHERE discord_id = ? AND username != ?', (discord_id, username))
+    conn.execute('UPDATE users SET discord_id = ? WHERE username = ?', (discord_id, username))
 
-def verify_password(stored_password, provided_password):
-    salt = stored_password[:32]
-    stored_key = stored_password[32:]
-    key = hashlib.pbkdf2_hmac('sha256', provided_password.encode('utf-8'), salt, 100000)
-    return key == stored_key
+def _insert_user(conn, username, hashed_password, email, discord_id):
+    conn.execute('UPDATE users SET discord_id = NULL WHERE discord_id = ?', (discord_id,))
+    conn.execute('INSERT INTO users (username, password, email, discord_id) VALUES (?, ?, ?, ?)',
+                 (username, hashed_password, email, discord_id))
 
-def register_user(username, password, email, discord_id):
+async def register_user(username, password, email, discord_id):
+    hashed_password = await auth.hash_password(password)
     try:
-        conn = get_db_connection()
-        hashed_password = hash_password(password)
-        conn.execute('INSERT INTO users (username, password, email, discord_id) VALUES (?, ?, ?, ?)',
-                    (username, hashed_password, email, discord_id))
-        conn.commit()
-        conn.close()
+        await db.write(_insert_user, username, hashed_password, email, discord_id)
         return True
     except sqlite3.IntegrityError:
         return False
@@ -61,38 +66,100 @@ def register_user(username, password, email, discord_id):
         print(f"Kayıt hatası: {e}")
         return False
 
-def verify_user(username, password):
+async def verify_user(username, password):
     try:
-        conn = get_db_connection()
-        user = conn.execute('SELECT * FROM users WHERE username = ?', (username,)).fetchone()
-        conn.close()
-        if user and verify_password(user['password'], password):
-            return True
-        return False
+        user = await db.fetchone('SELECT * FROM users WHERE username = ?', (username,))
     except Exception as e:
         print(f"Doğrulama hatası: {e}")
         return False
+    if not user:
+        return False
+    return await auth.verify_password(user['password'], password)
 
 # --- Uygulama içi durum (bellek) ---
-logged_in_users = {}  # user_id -> bool
-quiz_history = defaultdict(list)  # user_id -> list of dicts {kategori, sonuc, tarih}
-user_activity_count = defaultdict(int)  # basit aktivite sayacı
-user_goals = defaultdict(list)  # user_id -> list of goals: {id, text, due_date, completed}
-friends = defaultdict(set)  # user_id -> set of user_ids
-mentors = set()  # kullanıcı id'leri mentor olmak için kayıtlı
-mentor_requests = defaultdict(list)  # mentor_id -> list of mentee user_ids waiting
-mentor_pairs = {}  # mentee_id -> mentor_id
+quiz_history = QuizHistory(db)  # cevaplar/sonuçlar; quiz_history tablosuna toplu yazılır
+quiz_analytics = QuizAnalytics()  # quiz sonuç kayıtları ve sunucu/kategori/gün sayaçları
+user_activity_count = Leaderboard()  # aktivite sayacı; sunucu bazlı ve genel sıralama
+friends = FriendGraph()  # arkadaşlık grafı; kenarlar friendships tablosunda
+user_alan = {}  # user_id -> son quiz sonucundaki alan (mentor eşleştirmede kullanılır)
 daily_reward_claim = {}  # user_id -> date of last claim (YYYY-MM-DD)
-resource_bank = {
-    "yazilim": ["https://www.freecodecamp.org", "https://docs.python.org/3/"],
-    "veribilim": ["https://www.kaggle.com", "https://scikit-learn.org"],
-    "pazarlama": ["https://moz.com/learn/seo", "https://www.hubspot.com/resources"],
-    "tasarim": ["https://www.figma.com/resources/learn-design/", "https://www.behance.net"],
-    "girisim": ["https://www.ycombinator.com/library", "https://hbr.org"]
-}
 
-# Basit id üretimi için sayaç
-_goal_id_counter = 1
+# Bellekteki durum write-behind ile state_kv tablosuna yazılır
+# Sharded çalışmada diğer süreçlerin değişiklikleri feed ile yerel yapılara yansır
+feed = ChangeFeed(db) if sharding.SHARDED else None
+state = StateStore(db, feed=feed)
+state.add_source(quiz_history.collect, quiz_history.restore)
+state.add_source(quiz_analytics.collect, quiz_analytics.restore)
+state.add_source(user_activity_count.collect, user_activity_count.restore, user_activity_count.changes)
+state.add_source(friends.collect, friends.restore, friends.changes)
+state.register("user_alan", user_alan)
+# Süre dolumu (mentor_sweep) yalnızca birincil süreçte işlenir
+mentorship = MentorMatcher(state=state, deadlines=sharding.is_primary())  # mentors, mentee_requests, mentor_pairs
+user_goals = GoalStore(db, feed=feed)  # goals tablosu; bellekte aktif hedefler
+resource_catalog = ResourceCatalog(db, feed=feed)  # resources tablosu + FTS5 arama
+state.register("daily_reward_claim", daily_reward_claim)
+
+jobs = JobQueue()  # ertelenmiş etkileşimlerin ağır kısmı (sınırlı eşzamanlılık)
+router = Router(jobs=jobs)  # buton custom_id -> handler (bkz. on_interaction)
+role_cache = RoleCache()  # guild_id -> rol adı indeksi
+members = MemberIndex()  # user_id -> sunucular ve görünen adlar (üye olaylarıyla güncel)
+quizzes = QuizEngine()  # quizzes.json; View'lar setup_hook'ta derlenir
+quizzes.load()
+quiz_sessions = QuizSessions()  # (user_id, kategori) -> devam eden quiz
+
+logged_in_users = SessionStore(state=state)  # user_id -> Session (süreli, LRU sınırlı)
+
+# Tüm DM'ler bu kuyruktan gider. Ortak sunucusu kalmayan kullanıcılara gönderilmez;
+# sharded çalışmada indeks yalnızca bu sürecin sunucularını bildiği için kontrol kapalı
+dispatcher = DMDispatcher(bot, reachable=None if sharding.SHARDED else members.known)
+reminders = ReminderScheduler(db, dispatcher.send)
+
+lag_monitor = LagMonitor(metrics)
+metrics_server = None
+metrics.gauge("quiz_history_pending", lambda: len(quiz_history))
+metrics.gauge("user_goals", lambda: len(user_goals))
+metrics.gauge("logged_in_users", lambda: len(logged_in_users))
+metrics.gauge("quiz_sessions", lambda: len(quiz_sessions))
+metrics.gauge("quiz_sessions_bytes", quiz_sessions.memory_bytes)
+metrics.gauge("state_dirty_keys", state.pending)
+metrics.gauge("dm_queue_depth", dispatcher.depth)
+metrics.gauge("auth_pending", auth.pending)
+metrics.gauge("member_index_users", lambda: len(members))
+
+def _goals_reloaded(goals):
+    if not sharding.is_primary():
+        return
+    for goal in goals:
+        if goal.completed:
+            reminders.cancel(goal.id)
+        else:
+            reminders.schedule(goal)
+
+user_goals.on_reload(_goals_reloaded)
+
+async def _friendships_changed(user_ids):
+    # Yazılmamış ya da yazılmakta olan yerel kenarlar tablodan okunanla ezilmesin
+    await state.flush()
+    await friends.reload(db, user_ids)
+
+if feed is not None:
+    feed.on("activity_scores", lambda keys: user_activity_count.reload(db, keys))
+    feed.on("friendships", _friendships_changed)
+
+async def load_state():
+    if feed is not None:
+        await feed.prime()
+    count = await state.load()
+    count += await user_activity_count.load(db)
+    count += await friends.load(db)
+    count += await user_goals.load()
+    await resource_catalog.load()
+    logged_in_users.restore()
+    mentorship.rebuild()
+    state.start()
+    if feed is not None:
+        feed.start()
+    print(f"Kayıtlı durum yüklendi ({count} kayıt).")
 
 # --- UI Bileşenleri ---
 class LoginView(View):
@@ -112,16 +179,20 @@ class LoginModal(Modal):
     async def on_submit(self, interaction: discord.Interaction):
         username = self.username.value
         password = self.password.value
-        if verify_user(username, password):
-            logged_in_users[interaction.user.id] = True
-            conn = get_db_connection()
-            conn.execute('UPDATE users SET discord_id = ? WHERE username = ?', (interaction.user.id, username))
-            conn.commit()
-            conn.close()
-            await interaction.response.send_message("Başarıyla giriş yaptınız! Artık diğer komutları kullanabilirsiniz.", ephemeral=True)
+        # Hash kuyruğunda beklemek 3 saniyelik onay süresini aşabilir; önce onay verilir
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            ok = await verify_user(username, password)
+        except auth.AuthBusyError:
+            await interaction.followup.send("Sistem şu anda yoğun. Lütfen birkaç saniye sonra tekrar deneyin.", ephemeral=True)
+            return
+        if ok:
+            logged_in_users.login(interaction.user.id)
+            await db.write(_bind_discord_id, username, interaction.user.id)
+            await interaction.followup.send("Başarıyla giriş yaptınız! Artık diğer komutları kullanabilirsiniz.", ephemeral=True)
         else:
-            logged_in_users[interaction.user.id] = False
-            await interaction.response.send_message("Kullanıcı adı veya şifre hatalı. Lütfen tekrar deneyin.", ephemeral=True)
+            logged_in_users.logout(interaction.user.id)
+            await interaction.followup.send("Kullanıcı adı veya şifre hatalı. Lütfen tekrar deneyin.", ephemeral=True)
 
 class RegisterModal(Modal):
     def __init__(self):
@@ -137,32 +208,17 @@ class RegisterModal(Modal):
         username = self.username.value
         password = self.password.value
         email = self.email.value
-        if register_user(username, password, email, interaction.user.id):
-            logged_in_users[interaction.user.id] = False
-            await interaction.response.send_message("Başarıyla kayıt oldunuz! `!giris` ile giriş yapabilirsiniz.", ephemeral=True)
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            ok = await register_user(username, password, email, interaction.user.id)
+        except auth.AuthBusyError:
+            await interaction.followup.send("Sistem şu anda yoğun. Lütfen birkaç saniye sonra tekrar deneyin.", ephemeral=True)
+            return
+        if ok:
+            logged_in_users.logout(interaction.user.id)
+            await interaction.followup.send("Başarıyla kayıt oldunuz! `!giris` ile giriş yapabilirsiniz.", ephemeral=True)
         else:
-            await interaction.response.send_message("Kullanıcı adı zaten kullanımda. Farklı bir kullanıcı adı deneyin.", ephemeral=True)
-
-class QuizView(View):
-    def __init__(self, soru_no, kategori="kariyer"):
-        super().__init__(timeout=None)
-        self.soru_no = soru_no
-        self.kategori = kategori
-        if soru_no == 1:
-            self.add_item(Button(label="İngilizceyi çok iyi konuşurum", style=discord.ButtonStyle.primary, custom_id=f"{kategori}_q1_a"))
-            self.add_item(Button(label="Orta seviyedeyim", style=discord.ButtonStyle.primary, custom_id=f"{kategori}_q1_b"))
-            self.add_item(Button(label="Başlangıç seviyesindeyim", style=discord.ButtonStyle.primary, custom_id=f"{kategori}_q1_c"))
-            self.add_item(Button(label="Hiç bilmiyorum", style=discord.ButtonStyle.primary, custom_id=f"{kategori}_q1_d"))
-        elif soru_no == 2:
-            self.add_item(Button(label="Matematik", style=discord.ButtonStyle.primary, custom_id=f"{kategori}_q2_a"))
-            self.add_item(Button(label="Sanat/Tasarım", style=discord.ButtonStyle.primary, custom_id=f"{kategori}_q2_b"))
-            self.add_item(Button(label="Sosyal Bilimler", style=discord.ButtonStyle.primary, custom_id=f"{kategori}_q2_c"))
-            self.add_item(Button(label="Spor dalı", style=discord.ButtonStyle.primary, custom_id=f"{kategori}_q2_d"))
-        elif soru_no == 3:
-            self.add_item(Button(label="Akademisyen olmak isterim", style=discord.ButtonStyle.primary, custom_id=f"{kategori}_q3_a"))
-            self.add_item(Button(label="Şirketlerde çalışmak isterim", style=discord.ButtonStyle.primary, custom_id=f"{kategori}_q3_b"))
-            self.add_item(Button(label="Kendi işimi kurmak isterim", style=discord.ButtonStyle.primary, custom_id=f"{kategori}_q3_c"))
-            self.add_item(Button(label="Sporcu olmak isterim", style=discord.ButtonStyle.primary, custom_id=f"{kategori}_q3_d"))
+            await interaction.followup.send("Kullanıcı adı zaten kullanımda. Farklı bir kullanıcı adı deneyin.", ephemeral=True)
 
 class CareerChoiceView(View):
     def __init__(self):
@@ -174,23 +230,52 @@ class CareerChoiceView(View):
         self.add_item(Button(label="Girişimci", style=discord.ButtonStyle.primary, custom_id="girisim"))
 
 
+@bot.event
+async def setup_hook():
+    # Yeniden bağlanmalarda tekrar çalışmaması için on_ready yerine burada
+    global metrics_server
+    await setup_database()
+    await load_state()
+    quizzes.compile(bot)
+    dispatcher.start()
+    jobs.start()
+    session_sweep.start()
+    if sharding.is_primary():
+        # Zamanlanmış işler tek süreçte yürür; diğer süreçlerin hedefleri feed ile gelir
+        await reminders.load(user_goals.active())
+        reminders.start()
+        mentor_sweep.start()
+    lag_monitor.start()
+    metrics_server = await metrics.serve(port=sharding.metrics_port())
+    print("Zamanlayıcı başlatıldı.")
+
 @bot.event
 async def on_ready():
     print(f"Bot giriş yaptı: {bot.user}")
-    setup_database()
-    daily_goal_reminder.start()
-    print("Zamanlayıcı başlatıldı.")
 
 
 @bot.check
 async def global_check(ctx):
     if ctx.command and ctx.command.name == "giris":
         return True
-    if not logged_in_users.get(ctx.author.id, False):
+    if not logged_in_users.is_active(ctx.author.id):
         await ctx.send("Bu komutu kullanabilmek için önce `!giris` yaparak doğru şifreyle giriş yapmalısınız.")
         return False
     return True
 
+@bot.before_invoke
+async def _command_started(ctx):
+    ctx.started = time.perf_counter()
+
+@bot.after_invoke
+async def _command_finished(ctx):
+    # after_invoke komut hata verse de çağrılır
+    name = ctx.command.qualified_name
+    metrics.inc("commands_total", command=name)
+    if ctx.command_failed:
+        metrics.inc("command_errors_total", command=name)
+    metrics.observe("command_seconds", time.perf_counter() - ctx.started, command=name)
+
 @bot.command()
 async def giris(ctx):
     await ctx.send("Lütfen giriş yapın veya kayıt olun:", view=LoginView())
@@ -198,99 +283,108 @@ async def giris(ctx):
 @bot.command()
 async def cikis(ctx):
     """Kullanıcı çıkış yapar (session sonlandırma)"""
-    if logged_in_users.get(ctx.author.id, False):
-        logged_in_users[ctx.author.id] = False
+    if logged_in_users.logout(ctx.author.id):
         await ctx.send("Başarıyla çıkış yaptınız.")
     else:
         await ctx.send("Zaten girişli değilsiniz.")
 
 @bot.command()
 async def quiz(ctx, kategori: str = "kariyer"):
-    """Quiz başlat (kategori: kariyer, ilgi, iki farklı kategori örneği)"""
-    if not logged_in_users.get(ctx.author.id, False):
-        await ctx.send("Önce `!giris` yapmalısınız.")
-        return
+    """Quiz başlat (kategoriler quizzes.json'da tanımlı: kariyer, ilgi, ...)"""
     kategori = kategori.lower()
-    if kategori not in ["kariyer", "ilgi"]:
-        await ctx.send("Geçersiz kategori. Desteklenenler: kariyer, ilgi")
+    quiz = quizzes.get(kategori)
+    if quiz is None:
+        await ctx.send("Geçersiz kategori. Desteklenenler: " + ", ".join(quizzes.quizzes))
         return
-    user_activity_count[ctx.author.id] += 1
-    await ctx.send(f"{kategori} quizi başlıyor. 1. soru:", view=QuizView(1, kategori))
+    user_activity_count.increment(ctx.author.id, ctx.guild and ctx.guild.id)
+    await ctx.send(f"{kategori} quizi başlıyor. " + quiz.prompt(1), view=quiz.views[1])
 
 @bot.command()
 async def kariyer(ctx):
-    if not logged_in_users.get(ctx.author.id, False):
-        await ctx.send("Önce `!giris` yapmalısınız.")
-        return
     await ctx.send("Kariyer yolları için bir buton seçin:", view=CareerChoiceView())
 
 @bot.command()
 async def profil(ctx, member: discord.Member = None):
     """Gelişmiş profil gösterimi"""
-    if not logged_in_users.get(ctx.author.id, False):
-        await ctx.send("Önce `!giris` yapmalısınız.")
-        return
     if member is None:
         member = ctx.author
-    conn = get_db_connection()
-    user = conn.execute('SELECT * FROM users WHERE discord_id = ?', (member.id,)).fetchone()
-    conn.close()
+    user = await db.fetchone('SELECT * FROM users WHERE discord_id = ?', (member.id,))
     if not user:
         await ctx.send("Profil bilgileri bulunamadı.")
         return
 
     
-    history = quiz_history.get(member.id, [])
-    goals = user_goals.get(member.id, [])
-    friend_count = len(friends.get(member.id, set()))
-    activity = user_activity_count.get(member.id, 0)
+    history_count = await quiz_history.count(member.id)
+    friend_count = friends.count(member.id)
+    activity = user_activity_count.score(member.id)
 
     embed = discord.Embed(title="Profil Bilgileri", color=discord.Color.blue())
     embed.add_field(name="Kullanıcı Adı", value=user['username'], inline=True)
     embed.add_field(name="E-posta", value=user['email'] or "Belirtilmemiş", inline=True)
     embed.add_field(name="Kayıt Tarihi", value=user['created_at'], inline=False)
-    embed.add_field(name="Quiz Geçmişi (adet)", value=str(len(history)), inline=True)
+    embed.add_field(name="Quiz Geçmişi (adet)", value=str(history_count), inline=True)
     embed.add_field(name="Aktivite Sayacı", value=str(activity), inline=True)
     embed.add_field(name="Arkadaş Sayısı", value=str(friend_count), inline=True)
-    embed.add_field(name="Aktif Hedefler", value=str(len([g for g in goals if not g.get('completed', False)])), inline=True)
+    embed.add_field(name="Aktif Hedefler", value=str(user_goals.active_count(member.id)), inline=True)
     embed.add_field(name="Son Quiz Sonucu", value=user['quiz_results'] or "Henüz yok", inline=False)
 
     await ctx.send(embed=embed)
 
 @bot.command()
-async def leaderboard(ctx, limit: int = 10):
-    """Basit leaderboard: quiz yapan veya aktif kullanıcılar sıralaması"""
-    sorted_users = sorted(user_activity_count.items(), key=lambda x: x[1], reverse=True)
-    lines = []
-    count = 0
-    for uid, score in sorted_users:
-        member = ctx.guild.get_member(uid)
-        name = member.display_name if member else str(uid)
-        lines.append(f"{name}: {score}")
-        count += 1
-        if count >= limit:
-            break
-    if not lines:
-        await ctx.send("Henüz leaderboard verisi yok.")
+async def leaderboard(ctx, kapsam: str = "sunucu"):
+    """Aktivite sıralaması (sayfalı): !leaderboard [sunucu|genel]"""
+    guild_id = ctx.guild.id if ctx.guild and kapsam.lower() != "genel" else 0
+    footer = ""
+    rank = user_activity_count.rank(ctx.author.id, guild_id)
+    if rank:
+        footer = f"\n\nSıralamanız: {rank} ({user_activity_count.score(ctx.author.id, guild_id)} puan)"
+    await leaderboard_pages.send(ctx, guild_id, empty="Henüz leaderboard verisi yok.", footer=footer)
+
+@bot.command()
+async def kaynaklar(ctx, *, sorgu: str = None):
+    """Kaynak önerileri: !kaynaklar [alan veya arama metni]; boşsa quiz sonucunuza göre"""
+    if not sorgu:
+        alan = user_alan.get(ctx.author.id)
+        if alan is None:
+            await ctx.send("Önce `!quiz` çözün ya da bir alan/arama yazın. Alanlar: " + ", ".join(sorted(resource_catalog.alanlar)))
+            return
+        title, found = f"{alan} için önerilen kaynaklar", await resource_catalog.recommend({"alan": alan})
+    elif sorgu.lower() in resource_catalog.alanlar:
+        title, found = f"{sorgu.lower()} için kaynaklar", await resource_catalog.by_alan(sorgu.lower())
     else:
-        await ctx.send("Leaderboard:\n" + "\n".join(lines))
+        title, found = f"\"{sorgu}\" araması", await resource_catalog.search(sorgu)
+    if not found:
+        await ctx.send("Kaynak bulunamadı. Alanlar: " + ", ".join(sorted(resource_catalog.alanlar)))
+        return
+    await ctx.send(f"{title}:\n" + "\n".join(r.line() for r in found))
 
 @bot.command()
-async def kaynaklar(ctx, alan: str = "yazilim"):
-    """Kategoriye göre kaynak önerileri"""
-    alan = alan.lower()
-    if alan not in resource_bank:
-        await ctx.send("Geçersiz alan. Mevcut: " + ", ".join(resource_bank.keys()))
+@commands.has_permissions(administrator=True)
+async def kaynak_ekle(ctx, *, args: str):
+    """Yönetici: !kaynak_ekle alan | başlık | url | açıklama | etiket1,etiket2"""
+    parts = [p.strip() for p in args.split("|")]
+    if len(parts) < 3 or not parts[2].startswith(("http://", "https://")):
+        await ctx.send("Biçim: `!kaynak_ekle alan | başlık | url | açıklama | etiketler`")
         return
-    links = resource_bank[alan]
-    await ctx.send(f"{alan} için kaynaklar:\n" + "\n".join(links))
+    alan, title, url = parts[0].lower(), parts[1], parts[2]
+    description = parts[3] if len(parts) > 3 else ""
+    tags = ",".join(filter(None, [alan] + [t.strip() for t in (parts[4] if len(parts) > 4 else "").split(",")]))
+    resource_id = await resource_catalog.add(alan, title, url, description, tags)
+    await ctx.send(f"Kaynak kaydedildi. ID: {resource_id}")
+
+@bot.command()
+@commands.has_permissions(administrator=True)
+async def kaynak_sil(ctx, resource_id: int):
+    if await resource_catalog.remove(resource_id):
+        await ctx.send(f"Kaynak ID {resource_id} silindi.")
+    else:
+        await ctx.send("Kaynak bulunamadı.")
 
 @bot.command()
 async def set_goal(ctx, *, args: str):
     """Hedef oluştur: !set_goal <hedef metni> | <YYYY-MM-DD optional>
        Örnek: !set_goal Python öğren | 2025-12-31
     """
-    global _goal_id_counter
     parts = args.split("|")
     text = parts[0].strip()
     due = None
@@ -300,100 +394,115 @@ async def set_goal(ctx, *, args: str):
         except:
             await ctx.send("Tarih formatı hatalı. YYYY-MM-DD kullanın.")
             return
-    goal = {"id": _goal_id_counter, "text": text, "due_date": due, "created_at": datetime.date.today(), "completed": False}
-    _goal_id_counter += 1
-    user_goals[ctx.author.id].append(goal)
-    await ctx.send(f"Hedef kaydedildi. ID: {goal['id']}")
+    goal = await user_goals.add(ctx.author.id, text, due)
+    if sharding.is_primary():
+        # Hatırlatma döngüsü yalnızca birincil süreçte çalışır; diğerleri hedefi feed ile alır
+        reminders.schedule(goal)
+    goal_pages.invalidate(ctx.author.id)
+    await ctx.send(f"Hedef kaydedildi. ID: {goal.id}")
 
 @bot.command()
 async def list_goals(ctx):
-    goals = user_goals.get(ctx.author.id, [])
-    if not goals:
-        await ctx.send("Hiç hedefiniz yok.")
-        return
-    lines = []
-    for g in goals:
-        status = "Tamamlandı" if g.get('completed') else "Aktif"
-        due = g['due_date'].isoformat() if g['due_date'] else "Belirtilmemiş"
-        lines.append(f"ID {g['id']} - {g['text']} - Durum: {status} - Bitiş: {due}")
-    await ctx.send("\n".join(lines))
+    await goal_pages.send(ctx, ctx.author.id, owner=ctx.author.id, empty="Hiç hedefiniz yok.")
 
 @bot.command()
 async def complete_goal(ctx, goal_id: int):
-    goals = user_goals.get(ctx.author.id, [])
-    for g in goals:
-        if g['id'] == goal_id:
-            g['completed'] = True
-            await ctx.send(f"Hedef ID {goal_id} tamamlandı.")
-            return
-    await ctx.send("Hedef bulunamadı.")
+    if await user_goals.complete(ctx.author.id, goal_id) is None:
+        # Aktif değil: bellekte yalnızca aktif hedefler var, tamamlanmış mı diye tabloya bakılır
+        goal = await user_goals.find(ctx.author.id, goal_id)
+        if goal is not None and goal.completed:
+            await ctx.send(f"Hedef ID {goal_id} zaten tamamlanmış.")
+        else:
+            await ctx.send("Hedef bulunamadı.")
+        return
+    reminders.cancel(goal_id)
+    goal_pages.invalidate(ctx.author.id)
+    await ctx.send(f"Hedef ID {goal_id} tamamlandı.")
 
 @bot.command()
-async def be_mentor(ctx):
-    """Kullanıcı mentor olarak kayıt olur"""
-    mentors.add(ctx.author.id)
-    await ctx.send("Mentor olarak kayıt oldunuz. Menteeler sizi isteyebilir.")
+async def be_mentor(ctx, kapasite: int = DEFAULT_CAPACITY, alan: str = None):
+    """Kullanıcı mentor olarak kayıt olur: !be_mentor [kapasite] [alan]"""
+    mentorship.add_mentor(ctx.author.id, kapasite, alan.lower() if alan else None)
+    await ctx.send(f"Mentor olarak kayıt oldunuz (kapasite: {max(1, kapasite)}). Menteeler sizi isteyebilir.")
 
 @bot.command()
-async def request_mentor(ctx):
-    """Kullanıcı mentor talep eder; rastgele bir mentor sıraya konulur"""
-    if ctx.author.id in mentor_pairs:
+async def request_mentor(ctx, alan: str = None):
+    """Kullanıcı mentor talep eder; en boş (varsa quiz alanına uygun) mentora yönlendirilir"""
+    if ctx.author.id in mentorship.pairs:
         await ctx.send("Zaten bir mentora eşleştirilmişsiniz.")
         return
-    if not mentors:
-        await ctx.send("Şu anda mentor yok. Daha sonra tekrar deneyin.")
+    if ctx.author.id in mentorship.requests:
+        await ctx.send("Zaten bekleyen bir mentorluk isteğiniz var.")
+        return
+    alan = alan.lower() if alan else user_alan.get(ctx.author.id)
+    # Mentor başka bir sunucuda olabilir; DM'lerde sunucu takma adı yerine genel ad
+    name = members.display_name(ctx.author.id)
+    mentor = mentorship.request(ctx.author.id, alan, name)
+    if mentor is None:
+        await ctx.send("Şu anda uygun mentor yok. Daha sonra tekrar deneyin.")
         return
-    
-    mentor_list = list(mentors)
-    mentor = min(mentor_list, key=lambda m: len(mentor_requests[m]))
-    mentor_requests[mentor].append(ctx.author.id)
     await ctx.send("Mentorluk isteğiniz alındı. Mentor uygun olduğunda size dönecektir.")
-    
-    guild = ctx.guild
-    mentor_member = guild.get_member(mentor)
-    if mentor_member:
-        try:
-            await mentor_member.send(f"{ctx.author.display_name} mentorluk talebinde bulundu. Onaylamak için `!accept_mentee {ctx.author.id}` komutunu kullanabilirsiniz.")
-        except:
-            pass
+    dispatcher.send(mentor, f"{name} mentorluk talebinde bulundu. Onaylamak için `!accept_mentee {ctx.author.id}` komutunu kullanabilirsiniz.")
 
 @bot.command()
 async def accept_mentee(ctx, mentee_id: int):
     """Mentor, kendisine gelen isteği kabul eder"""
-    if ctx.author.id not in mentors:
+    if not mentorship.is_mentor(ctx.author.id):
         await ctx.send("Bu komutu kullanmak için mentor olmalısınız ( !be_mentor ).")
         return
-    if mentee_id not in mentor_requests.get(ctx.author.id, []):
+    if not mentorship.accept(ctx.author.id, mentee_id):
         await ctx.send("Bu mentee size istek göndermemiş veya zaten alındı.")
         return
-    mentor_requests[ctx.author.id].remove(mentee_id)
-    mentor_pairs[mentee_id] = ctx.author.id
-    try:
-        guild = ctx.guild
-        mentee_member = guild.get_member(mentee_id)
-        if mentee_member:
-            await mentee_member.send(f"{ctx.author.display_name} sizi mentee olarak kabul etti.")
-    except:
-        pass
+    dispatcher.send(mentee_id, f"{members.display_name(ctx.author.id)} sizi mentee olarak kabul etti.")
     await ctx.send("Mentee kabul edildi ve eşleştirildi.")
 
 @bot.command()
 async def add_friend(ctx, member: discord.Member):
-    """Kullanıcı arkadaş ekler (karşılıklı onay yok - basit)"""
-    friends[ctx.author.id].add(member.id)
-    await ctx.send(f"{member.display_name} arkadaş listesine eklendi.")
+    """Kullanıcı arkadaş ekler; karşı taraf da eklerse arkadaşlık karşılıklı olur"""
+    if member.id == ctx.author.id:
+        await ctx.send("Kendinizi arkadaş olarak ekleyemezsiniz.")
+        return
+    if not friends.add(ctx.author.id, member.id):
+        await ctx.send(f"{member.display_name} zaten arkadaş listenizde.")
+        return
+    friend_pages.invalidate(ctx.author.id)
+    if friends.is_mutual(ctx.author.id, member.id):
+        await ctx.send(f"{member.display_name} arkadaş listesine eklendi. Artık karşılıklı arkadaşsınız!")
+    else:
+        await ctx.send(f"{member.display_name} arkadaş listesine eklendi.")
+
+@bot.command()
+async def remove_friend(ctx, member: discord.Member):
+    if friends.remove(ctx.author.id, member.id):
+        friend_pages.invalidate(ctx.author.id)
+        await ctx.send(f"{member.display_name} arkadaş listenizden çıkarıldı.")
+    else:
+        await ctx.send(f"{member.display_name} arkadaş listenizde değil.")
 
 @bot.command()
 async def friends_list(ctx):
-    fset = friends.get(ctx.author.id, set())
-    if not fset:
-        await ctx.send("Arkadaş listeniz boş.")
+    await friend_pages.send(ctx, ctx.author.id, owner=ctx.author.id, empty="Arkadaş listeniz boş.")
+
+@bot.command()
+async def ortak_arkadas(ctx, member: discord.Member):
+    """Bir kullanıcıyla ortak arkadaşlarınız: !ortak_arkadas @kullanıcı"""
+    common = friends.common(ctx.author.id, member.id)
+    mutual = "Karşılıklı arkadaşsınız." if friends.is_mutual(ctx.author.id, member.id) else "Karşılıklı arkadaş değilsiniz."
+    if not common:
+        await ctx.send(f"{member.display_name} ile ortak arkadaşınız yok. {mutual}")
+        return
+    names = [members.display_name(uid, ctx.guild) for uid in list(common)[:20]]
+    await ctx.send(f"{member.display_name} ile {len(common)} ortak arkadaşınız var. {mutual}\n" + "\n".join(names))
+
+@bot.command()
+async def arkadas_onerileri(ctx, limit: int = 5):
+    """Arkadaşlarınızın arkadaşlarından öneriler: !arkadas_onerileri [adet]"""
+    suggestions = friends.suggestions(ctx.author.id, max(1, min(limit, 20)))
+    if not suggestions:
+        await ctx.send("Şu anda öneri yok. Arkadaş ekledikçe öneriler oluşur.")
         return
-    names = []
-    for uid in fset:
-        m = ctx.guild.get_member(uid)
-        names.append(m.display_name if m else str(uid))
-    await ctx.send("Arkadaşlarınız:\n" + "\n".join(names))
+    lines = [f"{members.display_name(uid, ctx.guild)} ({n} ortak arkadaş)" for uid, n in suggestions]
+    await ctx.send("Tanıyor olabileceğiniz kişiler:\n" + "\n".join(lines))
 
 @bot.command()
 async def claim_daily(ctx):
@@ -404,165 +513,248 @@ async def claim_daily(ctx):
         await ctx.send("Bugün zaten ödülünüzü aldınız.")
         return
     daily_reward_claim[ctx.author.id] = today
+    state.mark_dirty("daily_reward_claim", ctx.author.id)
     
-    user_activity_count[ctx.author.id] += 1
+    user_activity_count.increment(ctx.author.id, ctx.guild and ctx.guild.id)
     await ctx.send("Günlük ödül alındı. Aktivite sayacınız arttı.")
 
-
-@bot.event
-async def on_interaction(interaction: discord.Interaction):
-    if not interaction.data or 'custom_id' not in interaction.data:
+@bot.command()
+@commands.has_permissions(manage_guild=True)
+async def quiz_istatistik(ctx, kategori: str = None, gun: int = 30, kapsam: str = "sunucu"):
+    """Quiz sonuç dağılımı: !quiz_istatistik [kategori|hepsi] [gün] [sunucu|genel]"""
+    kategori = None if not kategori or kategori.lower() == "hepsi" else kategori.lower()
+    guild_id = ctx.guild.id if ctx.guild and kapsam.lower() != "genel" else None
+    gun = max(1, min(gun, 365))
+    result = await quiz_analytics.summary(db, guild_id, kategori, gun)
+    if not any(result.values()):
+        await ctx.send("Bu dönemde tamamlanan quiz yok.")
         return
-    cid = interaction.data["custom_id"]
-    user_id = interaction.user.id
+    embed = discord.Embed(title=f"Quiz Sonuçları (son {gun} gün, {kategori or 'tüm kategoriler'})", color=discord.Color.green())
+    for field, items in result.items():
+        if items:
+            embed.add_field(name=FIELD_NAMES.get(field, field),
+                            value="\n".join(f"{value}: {n}" for value, n in items[:10]), inline=True)
+    await ctx.send(embed=embed)
 
-    
-    if cid == "login":
-        await interaction.response.send_modal(LoginModal())
+@bot.command()
+@commands.has_permissions(manage_guild=True)
+async def quiz_istatistik_export(ctx, gun: int = 30, kapsam: str = "sunucu"):
+    """Günlük quiz sonuç sayılarını CSV olarak gönderir"""
+    guild_id = ctx.guild.id if ctx.guild and kapsam.lower() != "genel" else None
+    await state.flush()
+    data = await quiz_analytics.export_csv(db, guild_id, max(1, min(gun, 365)))
+    await ctx.send(file=discord.File(io.BytesIO(data.encode("utf-8")), filename="quiz_istatistik.csv"))
+
+@bot.command(name="metrics")
+@commands.has_permissions(administrator=True)
+async def metrics_command(ctx):
+    """Yönetici: en yavaş işlemler ve bellek içi yapı boyutları"""
+    text = "\n".join(metrics.summary())
+    await ctx.send(f"```\n{text[:1900]}\n```")
+
+
+# --- Sayfalı listeler (butonlar router üzerinden gelir) ---
+async def _leaderboard_rows(guild_id, cursor, limit):
+    offset = int(cursor[0]) if cursor else 0
+    rows = user_activity_count.top(limit + 1, guild_id, offset)
+    return rows[:limit], ((offset + limit,) if len(rows) > limit else None)
+
+def _render_leaderboard(guild, guild_id, rows, page_no):
+    lines = [f"{user_activity_count.rank(uid, guild_id)}. {members.display_name(uid, guild)}: {score}" for uid, score in rows]
+    return f"Leaderboard (sayfa {page_no}):\n" + "\n".join(lines)
+
+async def _friend_rows(user_id, cursor, limit):
+    last = int(cursor[0]) if cursor else -1
+    rows = heapq.nsmallest(limit + 1, (uid for uid in friends.friends(user_id) if uid > last))
+    return rows[:limit], ((rows[limit - 1],) if len(rows) > limit else None)
+
+def _render_friends(guild, user_id, rows, page_no):
+    names = [members.display_name(uid, guild) + (" (karşılıklı)" if friends.has(uid, user_id) else "") for uid in rows]
+    return f"Arkadaşlarınız (sayfa {page_no}):\n" + "\n".join(names)
+
+async def _goal_rows(user_id, cursor, limit):
+    after = (int(cursor[0]), cursor[1], int(cursor[2])) if cursor else None
+    return await user_goals.page(user_id, after, limit)
+
+def _render_goals(guild, user_id, goals, page_no):
+    lines = []
+    for g in goals:
+        status = "Tamamlandı" if g.completed else "Aktif"
+        due = g.due_date.isoformat() if g.due_date else "Belirtilmemiş"
+        text = g.text if len(g.text) <= 150 else g.text[:147] + "..."
+        lines.append(f"ID {g.id} - {text} - Durum: {status} - Bitiş: {due}")
+    return f"Hedefleriniz (sayfa {page_no}):\n" + "\n".join(lines)
+
+leaderboard_pages = Paginator(router, "lb", _leaderboard_rows, _render_leaderboard)
+friend_pages = Paginator(router, "arkadas", _friend_rows, _render_friends)
+goal_pages = Paginator(router, "hedef", _goal_rows, _render_goals)
+
+
+CAREER_ADVICE = {
+    "yazilim": "Yazılım geliştirici olmak için Python, JavaScript gibi dillerle başlayabilirsiniz. Kaynaklar için: !kaynaklar yazilim",
+    "veribilim": "Veri bilimci olmak için istatistik, makine öğrenmesi ve Python kütüphaneleri (pandas, sklearn) öğrenin. Kaynaklar: !kaynaklar veribilim",
+    "pazarlama": "Dijital pazarlama için SEO, sosyal medya ve reklam analizi öğrenin. Kaynaklar: !kaynaklar pazarlama",
+    "tasarim": "Tasarımcı olmak için Figma, Photoshop ve UX ilkelerini öğrenin. Kaynaklar: !kaynaklar tasarim",
+    "girisim": "Girişimcilik için iş planı ve müşteri doğrulama yapın. Kaynaklar: !kaynaklar girisim"
+}
+
+
+async def require_login(interaction):
+    if logged_in_users.is_active(interaction.user.id):
+        return True
+    await interaction.response.send_message("Önce `!giris` yapmalısınız.", ephemeral=True)
+    return False
+
+router.guard = require_login
+
+
+@router.exact("login", public=True)
+async def login_button(interaction):
+    await interaction.response.send_modal(LoginModal())
+
+
+@router.exact("register", public=True)
+async def register_button(interaction):
+    await interaction.response.send_modal(RegisterModal())
+
+
+@router.exact(*CAREER_ADVICE)
+async def career_button(interaction):
+    await interaction.response.send_message(CAREER_ADVICE[interaction.data["custom_id"]])
+
+
+# Quiz sonu veritabanı yazımı ve rol oluşturma/verme içerir; onay hemen verilir,
+# cevaplar followup ile gider
+@router.prefix("quiz", defer=True)
+async def quiz_answer(interaction, kategori, soru, secim):
+    quiz = quizzes.get(kategori)
+    if quiz is None:
         return
-    if cid == "register":
-        await interaction.response.send_modal(RegisterModal())
+    user_id = interaction.user.id
+    q_no = int(soru)
+    session = quiz_sessions.answer(user_id, kategori, len(quiz), q_no, secim)
+    if session is None:
+        await interaction.followup.send("Bu soru devam eden quizinizle eşleşmiyor. `!quiz` ile yeniden başlayın.", ephemeral=True)
         return
+    quiz_history.add_answer(user_id, kategori, q_no, quiz.choice_index(q_no, secim))
+    user_activity_count.increment(user_id, interaction.guild_id)
 
-    if not logged_in_users.get(user_id, False):
-        await interaction.response.send_message("Önce `!giris` yapmalısınız.", ephemeral=True)
+    if not session.finished:
+        await interaction.followup.send(quiz.prompt(session.step), view=quiz.views[session.step], ephemeral=True)
         return
 
-    
-    if "_q" in cid:
-        parts = cid.split("_q")
-        kategori = parts[0]
-        rest = parts[1]  
-        q_no = int(rest.split("_")[0])
-        
-        now = datetime.datetime.utcnow().isoformat()
-        quiz_history[user_id].append({"kategori": kategori, "question": q_no, "choice": rest.split("_")[1], "tarih": now})
-        user_activity_count[user_id] += 1
-
-        
-        if q_no == 1:
-            await interaction.response.send_message("2. soru:", view=QuizView(2, kategori), ephemeral=True)
-            return
-        if q_no == 2:
-            await interaction.response.send_message("3. soru:", view=QuizView(3, kategori), ephemeral=True)
-            return
-        if q_no == 3:
-            
-            sonuc = quiz_history[user_id][-3:]  
-         
-            if any(c['choice'] == 'a' for c in sonuc if c['question'] == 1):
-                dil = "İleri Seviye"
-                uni = "Boğaziçi Üniversitesi veya yurtdışı"
-            elif any(c['choice'] == 'b' for c in sonuc if c['question'] == 1):
-                dil = "Orta Seviye"
-                uni = "Ankara Üniversitesi"
-            elif any(c['choice'] == 'c' for c in sonuc if c['question'] == 1):
-                dil = "Başlangıç"
-                uni = "Yerel üniversiteler"
-            else:
-                dil = "Başlangıç (geliştirme gerekiyor)"
-                uni = "Hazırlık programları önerilir"
-
-            if any(c['choice'] == 'a' for c in sonuc if c['question'] == 2):
-                meslek = "Mühendislik / Yazılım"
-            elif any(c['choice'] == 'b' for c in sonuc if c['question'] == 2):
-                meslek = "Tasarım / Sanat"
-            elif any(c['choice'] == 'c' for c in sonuc if c['question'] == 2):
-                meslek = "Sosyal Bilimler"
-            else:
-                meslek = "Spor / Beden eğitimi"
-
-            
-            conn = get_db_connection()
-            summary = f"Dil: {dil}, Üniversite: {uni}, Meslek: {meslek}"
-            conn.execute('UPDATE users SET quiz_results = ? WHERE discord_id = ?', (summary, user_id))
-            conn.commit()
-            conn.close()
-
-           
-            guild = interaction.guild
-            if guild:
-                role_name_map = {
-                    "Mühendislik / Yazılım": "Yazılım Adayı",
-                    "Tasarım / Sanat": "Tasarım Adayı",
-                    "Sosyal Bilimler": "Sosyal Aday",
-                    "Spor / Beden eğitimi": "Sporcu Aday"
-                }
-                role_name = role_name_map.get(meslek)
-                if role_name:
-                  
-                    role = discord.utils.get(guild.roles, name=role_name)
-                    if role is None:
-                        try:
-                            role = await guild.create_role(name=role_name)
-                        except Exception as e:
-                            print(f"Rol oluşturulamadı: {e}")
-                            role = None
-                   
-                    if role:
-                        member = guild.get_member(user_id)
-                        if member:
-                            try:
-                                await member.add_roles(role)
-                            except Exception as e:
-                                print(f"Rol verilemedi: {e}")
-
-
-            alan_key = None
-            if "Yazılım" in meslek:
-                alan_key = "yazilim"
-            elif "Tasarım" in meslek:
-                alan_key = "tasarim"
-            elif "Veri" in meslek:
-                alan_key = "veribilim"
-            elif "Pazarlama" in meslek:
-                alan_key = "pazarlama"
-            else:
-                alan_key = "girisim"
-
-            resources = resource_bank.get(alan_key, [])
-
-            quiz_history[user_id].append({"kategori": kategori, "result_summary": summary, "tarih": now})
-            await interaction.response.send_message(
-                f"Quiz tamamlandı!\nDil: {dil}\nÖnerilen Üniversite: {uni}\nUygun meslek: {meslek}\nKaynaklar:\n" + "\n".join(resources)
-            )
-            return
+    quiz_sessions.finish(session)
+    sonuc = quiz.score(session.answers)
+    summary = quiz.summary(sonuc)
+    quiz_analytics.record(user_id, interaction.guild_id, kategori, sonuc)
+    await db.execute('UPDATE users SET quiz_results = ? WHERE discord_id = ?', (summary, user_id))
 
+    guild = interaction.guild
+    role_name = sonuc.get("rol")
+    if guild and role_name:
+        try:
+            role = await role_cache.get_or_create(guild, role_name)
+        except Exception as e:
+            print(f"Rol oluşturulamadı: {e}")
+            role = None
+        # Sunucu etkileşiminde tıklayan kullanıcı zaten Member; indeks dolmadan da çalışır
+        if role:
+            role_cache.grant(interaction.user, role)
+
+    if sonuc.get("alan"):
+        user_alan[user_id] = sonuc["alan"]
+        state.mark_dirty("user_alan", user_id)
+    resources = await resource_catalog.recommend(sonuc, 3)
+
+    quiz_history.add_result(user_id, kategori, summary)
+    lines = ["Quiz tamamlandı!", quiz.report(sonuc)]
+    if resources:
+        lines.append("Kaynaklar:\n" + "\n".join(r.line() for r in resources))
+    await interaction.followup.send("\n".join(line for line in lines if line))
 
-    cevaplar2 = {
-        "yazilim": "Yazılım geliştirici olmak için Python, JavaScript gibi dillerle başlayabilirsiniz. Kaynaklar için: !kaynaklar yazilim",
-        "veribilim": "Veri bilimci olmak için istatistik, makine öğrenmesi ve Python kütüphaneleri (pandas, sklearn) öğrenin. Kaynaklar: !kaynaklar veribilim",
-        "pazarlama": "Dijital pazarlama için SEO, sosyal medya ve reklam analizi öğrenin. Kaynaklar: !kaynaklar pazarlama",
-        "tasarim": "Tasarımcı olmak için Figma, Photoshop ve UX ilkelerini öğrenin. Kaynaklar: !kaynaklar tasarim",
-        "girisim": "Girişimcilik için iş planı ve müşteri doğrulama yapın. Kaynaklar: !kaynaklar girisim"
-    }
-    if cid in cevaplar2:
-        await interaction.response.send_message(cevaplar2[cid])
-        return
 
+@bot.event
+async def on_guild_role_create(role):
+    role_cache.role_created(role)
 
-@tasks.loop(minutes=60)
-async def daily_goal_reminder():
-    
-    now = datetime.date.today()
-    for user_id, goals in user_goals.items():
-        for g in goals:
-            if g.get("completed"):
-                continue
-            due = g.get("due_date")
-            if due and (due - now).days in (1, 0): 
-                
-                for guild in bot.guilds:
-                    member = guild.get_member(user_id)
-                    if member:
-                        try:
-                            if (due - now).days == 0:
-                                await member.send(f"Hedefinizin son günü: {g['text']}")
-                            else:
-                                await member.send(f"Hedefinize 1 gün kaldı: {g['text']}")
-                        except:
-                            pass
+@bot.event
+async def on_guild_role_update(before, after):
+    role_cache.role_updated(before, after)
+
+@bot.event
+async def on_guild_role_delete(role):
+    role_cache.role_deleted(role)
+
+@bot.event
+async def on_guild_remove(guild):
+    role_cache.forget_guild(guild)
+    members.remove_guild(guild)
+
+@bot.event
+async def on_guild_available(guild):
+    # Açılışta ve kesintiden dönen sunucular için; üye listesi bu noktada yüklü
+    members.add_guild(guild)
+
+@bot.event
+async def on_guild_join(guild):
+    members.add_guild(guild)
+
+@bot.event
+async def on_member_join(member):
+    members.add(member)
+
+@bot.event
+async def on_raw_member_remove(payload):
+    # Önbellekte olmayan üyeler için de gelir (on_member_remove gelmez)
+    members.remove(payload.guild_id, payload.user.id)
+
+@bot.event
+async def on_member_update(before, after):
+    members.member_updated(before, after)
+
+@bot.event
+async def on_user_update(before, after):
+    members.user_updated(before, after)
+
+
+@bot.event
+async def on_interaction(interaction: discord.Interaction):
+    if interaction.type == discord.InteractionType.component:
+        await router.dispatch(interaction)
+
+
+@tasks.loop(minutes=1)
+async def session_sweep():
+    logged_in_users.sweep()
+    quiz_sessions.sweep()
+
+
+@tasks.loop(minutes=5)
+async def mentor_sweep():
+    for mentee_id, mentor_id, req in mentorship.sweep():
+        if mentor_id is None:
+            dispatcher.send(mentee_id, "Mentorluk isteğiniz zamanında yanıtlanmadı ve şu anda uygun başka mentor yok. Daha sonra `!request_mentor` ile tekrar deneyebilirsiniz.")
+        else:
+            dispatcher.send(mentor_id, f"{req['ad'] or members.display_name(mentee_id)} mentorluk talebinde bulundu. Onaylamak için `!accept_mentee {mentee_id}` komutunu kullanabilirsiniz.")
+
+
+async def main():
+    async with bot:
+        try:
+            await bot.start("")
+        finally:
+            # Kapanışta bekleyen durum diske yazılır
+            reminders.stop()
+            dispatcher.stop()
+            jobs.stop()
+            lag_monitor.stop()
+            if feed is not None:
+                feed.stop()
+            if metrics_server is not None:
+                metrics_server.close()
+            await state.stop()
+            db.close()
 
 
 if __name__ == "__main__":
-    bot.run("")
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,156 @@
+"""Discord DM gönderim kuyruğu.
+
+Komutlar DM göndermek için beklemez; dispatcher.send(user_id, mesaj) mesajı
+kuyruğa ekleyip hemen döner. Arka plandaki işçiler mesajları gönderir:
+
+- Aynı kullanıcıya henüz gönderilmemiş birden fazla mesaj tek mesajda
+  birleştirilir.
+- Genel ve kullanıcı (route) bazlı token bucket'lar Discord hız sınırlarına
+  takılmadan gönderim hızını ayarlar.
+- 429 ve 5xx hatalarında jitter'lı üstel geri çekilmeyle yeniden denenir;
+  DM'i kapalı kullanıcılar (403) sessizce atlanır.
+- reachable verilmişse botla ortak sunucusu kalmamış kullanıcılara API
+  çağrısı yapılmadan mesaj düşülür (Discord bu DM'leri zaten reddeder).
+- Gönderim sayaçları stats içinde tutulur.
+"""
+import asyncio
+import random
+import time
+
+import discord
+
+WORKERS = 4
+GLOBAL_RATE = (40, 1.0)   # 40 istek / saniye
+ROUTE_RATE = (5, 5.0)     # kanal başına 5 istek / 5 saniye
+MAX_ATTEMPTS = 4
+BASE_BACKOFF = 1.0
+MAX_MESSAGE = 2000
+MAX_BUCKETS = 10000
+
+
+class TokenBucket:
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity, per):
+        self.capacity = capacity
+        self.rate = capacity / per
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def reserve(self):
+        """Bir token ayırır; token'ın kullanılabilmesi için beklenecek süreyi döner"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def full(self):
+        return self.tokens + (time.monotonic() - self.updated) * self.rate >= self.capacity
+
+
+def _chunks(messages):
+    """Mesajları 2000 karakter sınırını aşmayacak şekilde birleştirir"""
+    current = ""
+    for message in messages:
+        while len(message) > MAX_MESSAGE:
+            if current:
+                yield current
+                current = ""
+            yield message[:MAX_MESSAGE]
+            message = message[MAX_MESSAGE:]
+        if current and len(current) + 2 + len(message) > MAX_MESSAGE:
+            yield current
+            current = ""
+        current = f"{current}\n\n{message}" if current else message
+    if current:
+        yield current
+
+
+class DMDispatcher:
+    def __init__(self, bot, workers=WORKERS, reachable=None):
+        self.bot = bot
+        self.workers = workers
+        self.reachable = reachable  # reachable(user_id) -> bool
+        self._queue = asyncio.Queue()
+        self._pending = {}  # user_id -> [(mesaj, kuyruğa girme zamanı)]
+        self._global = TokenBucket(*GLOBAL_RATE)
+        self._routes = {}   # user_id -> TokenBucket
+        self._tasks = []
+        self.stats = {"queued": 0, "coalesced": 0, "sent": 0, "retried": 0,
+                      "failed": 0, "forbidden": 0, "unreachable": 0, "delay_total": 0.0}
+
+    def send(self, user_id, text):
+        pending = self._pending.get(user_id)
+        if pending is not None:
+            pending.append((text, time.monotonic()))
+            self.stats["coalesced"] += 1
+        else:
+            self._pending[user_id] = [(text, time.monotonic())]
+            self._queue.put_nowait(user_id)
+        self.stats["queued"] += 1
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def _route(self, user_id):
+        bucket = self._routes.get(user_id)
+        if bucket is None:
+            if len(self._routes) >= MAX_BUCKETS:
+                self._routes = {uid: b for uid, b in self._routes.items() if not b.full()}
+            bucket = self._routes[user_id] = TokenBucket(*ROUTE_RATE)
+        return bucket
+
+    async def _throttle(self, user_id):
+        delay = max(self._global.reserve(), self._route(user_id).reserve())
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _deliver(self, user_id, content):
+        for attempt in range(MAX_ATTEMPTS):
+            await self._throttle(user_id)
+            try:
+                user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+                await user.send(content)
+                return True
+            except discord.Forbidden:
+                self.stats["forbidden"] += 1
+                return False
+            except discord.HTTPException as e:
+                if e.status != 429 and e.status < 500:
+                    break
+                retry_after = getattr(e, "retry_after", None) or BASE_BACKOFF * 2 ** attempt
+                self.stats["retried"] += 1
+                await asyncio.sleep(retry_after + random.uniform(0, retry_after / 2))
+        self.stats["failed"] += 1
+        return False
+
+    async def _worker(self):
+        await self.bot.wait_until_ready()
+        while True:
+            user_id = await self._queue.get()
+            try:
+                # Kuyruktan çıkınca birleştirme biter; yeni mesajlar yeni iş açar
+                messages = self._pending.pop(user_id, [])
+                if self.reachable is not None and not self.reachable(user_id):
+                    self.stats["unreachable"] += 1
+                    continue
+                for content in _chunks([text for text, queued_at in messages]):
+                    if await self._deliver(user_id, content):
+                        self.stats["sent"] += 1
+                now = time.monotonic()
+                self.stats["delay_total"] += sum(now - queued_at for text, queued_at in messages)
+            except Exception as e:
+                self.stats["failed"] += 1
+                print(f"DM gönderilemedi ({user_id}): {e}")
+            finally:
+                self._queue.task_done()
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
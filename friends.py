@@ -0,0 +1,176 @@
+"""Arkadaşlık grafı.
+
+Kenarlar yönlüdür (A, B'yi ekledi); iki yön de varsa arkadaşlık karşılıklıdır.
+Tüm kenarlar friendships tablosunda tutulur ve açılışta seyrek bir komşuluk
+yapısına (user_id -> set) yüklenir; değişiklikler StateStore flush'ıyla
+toplu yazılır.
+
+Arkadaş önerileri (arkadaşımın arkadaşları) kullanıcı başına bir sayaçta
+tutulur: sayaç[aday] = adayı ekleyen arkadaş sayısı. Sayaç ilk sorguda bir
+kez hesaplanır, sonrasında her kenar değişikliğinde yalnızca etkilenen
+sayaçlar güncellenir. Sayaçlar en son kullanılan MAX_CACHED kullanıcı için
+bellekte kalır.
+"""
+import heapq
+import time
+from collections import Counter, OrderedDict
+
+MAX_CACHED = 5000
+
+
+class FriendGraph:
+    def __init__(self, max_cached=MAX_CACHED):
+        self.max_cached = max_cached
+        self._out = {}  # user_id -> eklediği kullanıcılar
+        self._in = {}   # user_id -> onu ekleyen kullanıcılar
+        self._fof = OrderedDict()  # user_id -> Counter(aday -> ortak arkadaş sayısı)
+        self._dirty = {}  # (user_id, friend_id) -> eklenme zamanı veya None (silindi)
+
+    def friends(self, user_id):
+        return self._out.get(user_id, ())
+
+    def count(self, user_id):
+        return len(self._out.get(user_id, ()))
+
+    def has(self, user_id, friend_id):
+        return friend_id in self._out.get(user_id, ())
+
+    def is_mutual(self, a, b):
+        return self.has(a, b) and self.has(b, a)
+
+    def common(self, a, b):
+        """İki kullanıcının ortak arkadaşları"""
+        fa, fb = self._out.get(a, set()), self._out.get(b, set())
+        if len(fa) > len(fb):
+            fa, fb = fb, fa
+        return {uid for uid in fa if uid in fb}
+
+    # --- değişiklik ---
+    def _link(self, user_id, friend_id):
+        self._out.setdefault(user_id, set()).add(friend_id)
+        self._in.setdefault(friend_id, set()).add(user_id)
+
+    def add(self, user_id, friend_id):
+        """Kenarı ekler; zaten varsa False döner"""
+        if user_id == friend_id or self.has(user_id, friend_id):
+            return False
+        self._link(user_id, friend_id)
+        self._update_fof(user_id, friend_id, 1)
+        self._dirty[(user_id, friend_id)] = int(time.time())
+        return True
+
+    def remove(self, user_id, friend_id):
+        if not self.has(user_id, friend_id):
+            return False
+        self._unlink(user_id, friend_id)
+        self._dirty[(user_id, friend_id)] = None
+        return True
+
+    def _unlink(self, user_id, friend_id):
+        self._update_fof(user_id, friend_id, -1)
+        self._out[user_id].discard(friend_id)
+        if not self._out[user_id]:
+            del self._out[user_id]
+        self._in[friend_id].discard(user_id)
+        if not self._in[friend_id]:
+            del self._in[friend_id]
+
+    def _update_fof(self, user_id, friend_id, delta):
+        # user_id -> friend_id kenarı: user_id'nin sayacında friend_id'nin
+        # arkadaşları, user_id'yi ekleyenlerin sayacında friend_id değişir.
+        counter = self._fof.get(user_id)
+        if counter is not None:
+            for uid in self._out.get(friend_id, ()):
+                counter[uid] += delta
+                if counter[uid] <= 0:
+                    del counter[uid]
+        for uid in self._in.get(user_id, ()):
+            counter = self._fof.get(uid)
+            if counter is not None:
+                counter[friend_id] += delta
+                if counter[friend_id] <= 0:
+                    del counter[friend_id]
+
+    # --- öneriler ---
+    def _counter(self, user_id):
+        counter = self._fof.get(user_id)
+        if counter is not None:
+            self._fof.move_to_end(user_id)
+            return counter
+        counter = Counter()
+        for friend_id in self._out.get(user_id, ()):
+            counter.update(self._out.get(friend_id, ()))
+        self._fof[user_id] = counter
+        if len(self._fof) > self.max_cached:
+            self._fof.popitem(last=False)
+        return counter
+
+    def suggestions(self, user_id, k=5):
+        """(aday, ortak arkadaş sayısı) listesi; en çok ortak arkadaşı olan önce"""
+        counter = self._counter(user_id)
+        known = self._out.get(user_id, set())
+        candidates = ((n, uid) for uid, n in counter.items() if uid != user_id and uid not in known)
+        return [(uid, n) for n, uid in heapq.nlargest(k, candidates)]
+
+    async def load(self, db):
+        rows = await db.fetchall('SELECT user_id, friend_id FROM friendships')
+        for row in rows:
+            self._link(row['user_id'], row['friend_id'])
+        self._fof.clear()
+        return len(rows)
+
+    async def reload(self, db, user_ids):
+        """Başka süreçte değişen kullanıcıların kenarlarını tablodan yeniler.
+
+        Çağıran önce bekleyen değişiklikleri yazmalıdır (StateStore.flush);
+        okuma sırasında bu süreçte yapılan ve henüz yazılmamış değişiklikler
+        tablodan okunanın üzerine uygulanır.
+        """
+        user_ids = list(user_ids)
+        for i in range(0, len(user_ids), 500):
+            chunk = user_ids[i:i + 500]
+            chunk_ids = set(chunk)
+            rows = await db.fetchall(
+                f'SELECT user_id, friend_id FROM friendships WHERE user_id IN ({",".join("?" * len(chunk))})',
+                chunk)
+            stored = {}
+            for row in rows:
+                stored.setdefault(row['user_id'], set()).add(row['friend_id'])
+            for (uid, fid), added in self._dirty.items():
+                if uid in chunk_ids:
+                    if added is None:
+                        stored.get(uid, set()).discard(fid)
+                    else:
+                        stored.setdefault(uid, set()).add(fid)
+            for uid in chunk:
+                current = set(self._out.get(uid, ()))
+                new = stored.get(uid, set())
+                for fid in current - new:
+                    self._unlink(uid, fid)
+                for fid in new - current:
+                    self._link(uid, fid)
+                    self._update_fof(uid, fid, 1)
+
+    # --- StateStore kaynağı ---
+    def collect(self):
+        if not self._dirty:
+            return []
+        dirty, self._dirty = self._dirty, {}
+        added = [(uid, fid, ts) for (uid, fid), ts in dirty.items() if ts is not None]
+        removed = [(uid, fid) for (uid, fid), ts in dirty.items() if ts is None]
+        batches = []
+        if removed:
+            batches.append(('DELETE FROM friendships WHERE user_id = ? AND friend_id = ?', removed))
+        if added:
+            batches.append(('INSERT OR IGNORE INTO friendships (user_id, friend_id, created_at) VALUES (?, ?, ?)', added))
+        return batches
+
+    def restore(self, batches):
+        for sql, rows in batches:
+            for row in rows:
+                # Yazılamayan değişiklik daha yenisiyle ezilmediyse geri koy
+                self._dirty.setdefault((row[0], row[1]), row[2] if len(row) > 2 else None)
+
+    @staticmethod
+    def changes(batches):
+        return [("friendships", row[0]) for sql, rows in batches for row in rows]
@@ -0,0 +1,155 @@
+"""Hedef deposu.
+
+Hedefler goals tablosunda tutulur; id'yi tablo verir (AUTOINCREMENT, yeniden
+başlatmada ve süreçler arasında çakışmaz). Bellekte yalnızca aktif hedefler
+kalır: id -> Goal indeksi (O(1) tamamlama, hatırlatmalar) ve kullanıcı başına
+aktif id kümesi. Listeleme veritabanından sayfa sayfa yapılır; sıralama
+(durum, bitiş tarihi, id) olduğu için (user_id, completed, bitiş, id)
+indeksi üzerinden keyset ile ilerlenir ve her sayfanın maliyeti kullanıcının
+toplam hedef sayısından bağımsızdır.
+"""
+import datetime
+
+NO_DUE = "9999-12-31"  # bitişi olmayan hedefler sıralamada sona (goals.due_sort)
+PAGE_SIZE = 10
+
+
+class Goal:
+    __slots__ = ("id", "user_id", "text", "due_date", "created_at", "completed")
+
+    def __init__(self, id, user_id, text, due_date, created_at, completed=False):
+        self.id = id
+        self.user_id = user_id
+        self.text = text
+        self.due_date = due_date      # datetime.date veya None
+        self.created_at = created_at  # datetime.date
+        self.completed = completed
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(row['id'], row['user_id'], row['text'],
+                   datetime.date.fromisoformat(row['due_date']) if row['due_date'] else None,
+                   datetime.date.fromisoformat(row['created_at']), bool(row['completed']))
+
+    @property
+    def cursor(self):
+        """Sayfalama için sıralama anahtarı"""
+        return (int(self.completed), self.due_date.isoformat() if self.due_date else NO_DUE, self.id)
+
+
+def _insert(conn, user_id, text, due_date, created_at, changes):
+    goal_id = conn.execute('INSERT INTO goals (user_id, text, due_date, created_at) VALUES (?, ?, ?, ?)',
+                           (user_id, text, due_date, created_at)).lastrowid
+    if changes is not None:
+        conn.executemany(*changes([("goals", goal_id)]))
+    return goal_id
+
+
+def _complete(conn, goal_id, changes):
+    conn.execute("UPDATE goals SET completed = 1, completed_at = CURRENT_TIMESTAMP WHERE id = ?", (goal_id,))
+    if changes is not None:
+        conn.executemany(*changes([("goals", goal_id)]))
+
+
+class GoalStore:
+    def __init__(self, db, feed=None):
+        self.db = db
+        self._changes = feed.batch if feed is not None else None
+        self._active = {}   # goal_id -> Goal
+        self._by_user = {}  # user_id -> {goal_id}
+        self._after = []
+        if feed is not None:
+            feed.on("goals", self.reload)
+
+    def __len__(self):
+        return len(self._active)
+
+    def _index(self, goal):
+        self._active[goal.id] = goal
+        self._by_user.setdefault(goal.user_id, set()).add(goal.id)
+
+    def _unindex(self, goal_id):
+        goal = self._active.pop(goal_id, None)
+        if goal is None:
+            return
+        ids = self._by_user[goal.user_id]
+        ids.discard(goal_id)
+        if not ids:
+            del self._by_user[goal.user_id]
+
+    def get(self, goal_id):
+        """Aktif hedef (yoksa None)"""
+        return self._active.get(goal_id)
+
+    def active(self):
+        return self._active.values()
+
+    def active_count(self, user_id):
+        return len(self._by_user.get(user_id, ()))
+
+    async def load(self):
+        rows = await self.db.fetchall('SELECT * FROM goals WHERE completed = 0')
+        for row in rows:
+            self._index(Goal.from_row(row))
+        return len(rows)
+
+    async def add(self, user_id, text, due_date=None):
+        created = datetime.date.today()
+        goal_id = await self.db.write(_insert, user_id, text, due_date.isoformat() if due_date else None,
+                                      created.isoformat(), self._changes)
+        goal = Goal(goal_id, user_id, text, due_date, created)
+        self._index(goal)
+        return goal
+
+    async def find(self, user_id, goal_id):
+        """Kullanıcının hedefi (tamamlanmışlar dahil); yoksa None"""
+        row = await self.db.fetchone('SELECT * FROM goals WHERE id = ? AND user_id = ?', (goal_id, user_id))
+        return Goal.from_row(row) if row else None
+
+    async def complete(self, user_id, goal_id):
+        """Kullanıcının aktif hedefini tamamlar; aktif değilse None döner"""
+        goal = self._active.get(goal_id)
+        if goal is None or goal.user_id != user_id:
+            return None
+        await self.db.write(_complete, goal_id, self._changes)
+        goal.completed = True
+        self._unindex(goal_id)
+        return goal
+
+    async def page(self, user_id, after=None, limit=PAGE_SIZE):
+        """Kullanıcının hedefleri: önce aktifler, bitiş tarihine göre.
+
+        after: önceki sayfanın son hedefinin cursor'ı. (hedefler, sonraki
+        sayfa varsa cursor) döner.
+        """
+        sql = 'SELECT * FROM goals WHERE user_id = ?'
+        params = [user_id]
+        if after is not None:
+            sql += " AND (completed, due_sort, id) > (?, ?, ?)"
+            params += list(after)
+        sql += " ORDER BY completed, due_sort, id LIMIT ?"
+        params.append(limit + 1)
+        rows = await self.db.fetchall(sql, params)
+        goals = [Goal.from_row(row) for row in rows[:limit]]
+        return goals, (goals[-1].cursor if len(rows) > limit else None)
+
+    # --- değişiklik akışı ---
+    def on_reload(self, callback):
+        """callback(hedefler): başka süreçte eklenen/tamamlanan hedefler yüklendikten sonra"""
+        self._after.append(callback)
+
+    async def reload(self, goal_ids):
+        goal_ids = list(goal_ids)
+        goals = []
+        for i in range(0, len(goal_ids), 500):
+            chunk = goal_ids[i:i + 500]
+            rows = await self.db.fetchall(f'SELECT * FROM goals WHERE id IN ({",".join("?" * len(chunk))})', chunk)
+            for row in rows:
+                goal = Goal.from_row(row)
+                if goal.completed:
+                    self._unindex(goal.id)
+                else:
+                    self._index(goal)
+                goals.append(goal)
+        for callback in self._after:
+            callback(goals)
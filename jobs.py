@@ -0,0 +1,92 @@
+"""Arka plan iş kuyruğu.
+
+Etkileşimler Discord'un 3 saniyelik onay süresini kaçırmasın diye router
+önce defer() ile onay verir, asıl işi buraya bırakır. Sabit sayıda işçi
+kuyruktaki işleri yürütür; böylece eşzamanlı iş sayısı (veritabanı
+yazımları, rol oluşturma/verme) sınırlı kalır. Aynı anahtarlı işler
+(ör. aynı kullanıcının art arda tıklamaları) gönderildikleri sırayla ve
+tek tek çalışır. Kuyruk doluysa submit() QueueFull fırlatır.
+
+Ölçümler: job_queue_depth (gauge), job_wait_seconds (kuyrukta bekleme),
+job_seconds ve job_errors_total (iş adına göre).
+"""
+import asyncio
+import time
+from collections import deque
+
+from metrics import metrics
+
+WORKERS = 8
+MAX_PENDING = 1000
+
+
+class QueueFull(Exception):
+    pass
+
+
+class JobQueue:
+    def __init__(self, workers=WORKERS, max_pending=MAX_PENDING):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._queue = asyncio.Queue()
+        self._keys = {}     # anahtar -> sırasını bekleyen işler (anahtar varsa bir işi çalışıyor/kuyrukta)
+        self._pending = 0   # başlamamış iş sayısı
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._tasks = []
+        metrics.gauge("job_queue_depth", self.depth)
+
+    def depth(self):
+        return self._pending
+
+    def submit(self, key, name, func, *args):
+        """func(*args) coroutine'ini kuyruğa ekler ve hemen döner"""
+        if self._pending >= self.max_pending:
+            raise QueueFull()
+        job = (name, func, args, time.perf_counter())
+        waiting = self._keys.get(key)
+        if waiting is not None:
+            waiting.append(job)
+        else:
+            self._keys[key] = deque()
+            self._queue.put_nowait((key, job))
+        self._pending += 1
+        self._idle.clear()
+
+    async def _run(self, key, job):
+        name, func, args, queued_at = job
+        self._pending -= 1
+        started = time.perf_counter()
+        metrics.observe("job_wait_seconds", started - queued_at, job=name)
+        try:
+            await func(*args)
+        except Exception as e:
+            metrics.inc("job_errors_total", job=name)
+            print(f"Arka plan işi başarısız ({name}): {e}")
+        finally:
+            metrics.observe("job_seconds", time.perf_counter() - started, job=name)
+            waiting = self._keys[key]
+            if waiting:
+                self._queue.put_nowait((key, waiting.popleft()))
+            else:
+                del self._keys[key]
+                if not self._keys:
+                    self._idle.set()
+
+    async def _worker(self):
+        while True:
+            key, job = await self._queue.get()
+            await self._run(key, job)
+
+    async def join(self):
+        """Kuyruktaki ve çalışan tüm işler bitene kadar bekler"""
+        await self._idle.wait()
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
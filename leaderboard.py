@@ -0,0 +1,139 @@
+"""Artımlı aktivite sıralaması.
+
+Aktivite sayaçları yalnızca birer birer arttığı için her sıralama, skora göre
+azalan bir dizi ve her skorun dizideki ilk konumu ile tutulur. Bir artış,
+kullanıcıyı kendi skor bloğunun başına taşıyıp skorunu bir artırmaktan
+ibarettir (O(1)); sıra sorgusu O(1), ilk K sorgusu O(K)'dir.
+
+Her sunucu için ayrı, ayrıca tüm sunucular için genel (guild_id = 0) bir
+sıralama tutulur. Skor artışları StateStore flush'ı ile activity_scores
+tablosuna fark olarak eklenir (score = score + artış); böylece aynı tabloyu
+paylaşan birden fazla süreç birbirinin artışlarını ezmez.
+"""
+from collections import defaultdict
+
+GLOBAL = 0
+
+
+class RankIndex:
+    def __init__(self):
+        self._order = []        # skora göre azalan user_id'ler
+        self._pos = {}          # user_id -> _order içindeki konum
+        self._scores = {}       # user_id -> skor
+        self._block_start = {}  # skor -> bu skora sahip ilk konum
+
+    def __len__(self):
+        return len(self._order)
+
+    def load(self, items):
+        """(user_id, skor) çiftlerinden sıralamayı tek seferde kurar"""
+        self._order = [uid for uid, score in sorted(items, key=lambda x: x[1], reverse=True)]
+        self._scores = dict(items)
+        self._pos = {}
+        self._block_start = {}
+        for i, uid in enumerate(self._order):
+            self._pos[uid] = i
+            self._block_start.setdefault(self._scores[uid], i)
+
+    def score(self, user_id):
+        return self._scores.get(user_id, 0)
+
+    def increment(self, user_id):
+        if user_id not in self._pos:
+            self._pos[user_id] = len(self._order)
+            self._block_start.setdefault(0, len(self._order))
+            self._order.append(user_id)
+            self._scores[user_id] = 0
+        score = self._scores[user_id]
+        i = self._pos[user_id]
+        j = self._block_start[score]
+        # Kullanıcıyı bloğunun başına al; blok sınırı bir ileri kayar
+        other = self._order[j]
+        self._order[i], self._order[j] = other, user_id
+        self._pos[other], self._pos[user_id] = i, j
+        if j + 1 < len(self._order) and self._scores[self._order[j + 1]] == score:
+            self._block_start[score] = j + 1
+        else:
+            del self._block_start[score]
+        # Üstteki blok (score + 1) bitişik olduğu için başlangıcı değişmez
+        self._block_start.setdefault(score + 1, j)
+        self._scores[user_id] = score + 1
+        return score + 1
+
+    def rank(self, user_id):
+        """Eşit skorlar aynı sırayı paylaşır; kayıt yoksa None"""
+        if user_id not in self._scores:
+            return None
+        return self._block_start[self._scores[user_id]] + 1
+
+    def top(self, k, offset=0):
+        return [(uid, self._scores[uid]) for uid in self._order[offset:offset + k]]
+
+
+class Leaderboard:
+    def __init__(self):
+        self._boards = defaultdict(RankIndex)  # guild_id -> RankIndex, 0 = genel
+        self._dirty = {}  # (guild_id, user_id) -> henüz yazılmamış artış
+
+    def board(self, guild_id=None):
+        return self._boards[guild_id or GLOBAL]
+
+    def increment(self, user_id, guild_id=None):
+        self._boards[GLOBAL].increment(user_id)
+        self._dirty[(GLOBAL, user_id)] = self._dirty.get((GLOBAL, user_id), 0) + 1
+        if guild_id:
+            self._boards[guild_id].increment(user_id)
+            self._dirty[(guild_id, user_id)] = self._dirty.get((guild_id, user_id), 0) + 1
+
+    def score(self, user_id, guild_id=None):
+        return self.board(guild_id).score(user_id)
+
+    def rank(self, user_id, guild_id=None):
+        return self.board(guild_id).rank(user_id)
+
+    def top(self, k, guild_id=None, offset=0):
+        return self.board(guild_id).top(k, offset)
+
+    async def load(self, db):
+        rows = await db.fetchall('SELECT guild_id, user_id, score FROM activity_scores')
+        grouped = defaultdict(list)
+        for row in rows:
+            grouped[row['guild_id']].append((row['user_id'], row['score']))
+        for guild_id, items in grouped.items():
+            self._boards[guild_id].load(items)
+        return len(rows)
+
+    async def reload(self, db, user_ids):
+        """Başka süreçlerin artışlarını yerel sıralamalara uygular"""
+        user_ids = list(user_ids)
+        for i in range(0, len(user_ids), 500):
+            chunk = user_ids[i:i + 500]
+            rows = await db.fetchall(
+                f'SELECT guild_id, user_id, score FROM activity_scores WHERE user_id IN ({",".join("?" * len(chunk))})',
+                chunk)
+            for row in rows:
+                gid, uid = row['guild_id'], row['user_id']
+                board = self._boards[gid]
+                # Skorlar yalnızca artar; eksik kalan kadar birer birer ilerlet
+                for _ in range(row['score'] + self._dirty.get((gid, uid), 0) - board.score(uid)):
+                    board.increment(uid)
+
+    # --- StateStore kaynağı ---
+    def collect(self):
+        if not self._dirty:
+            return []
+        dirty, self._dirty = self._dirty, {}
+        rows = [(gid, uid, delta) for (gid, uid), delta in dirty.items()]
+        return [('''
+            INSERT INTO activity_scores (guild_id, user_id, score) VALUES (?, ?, ?)
+            ON CONFLICT (guild_id, user_id) DO UPDATE SET score = score + excluded.score
+        ''', rows)]
+
+    def restore(self, batches):
+        for sql, rows in batches:
+            for gid, uid, delta in rows:
+                self._dirty[(gid, uid)] = self._dirty.get((gid, uid), 0) + delta
+
+    @staticmethod
+    def changes(batches):
+        return [("activity_scores", uid) for sql, rows in batches for gid, uid, delta in rows]
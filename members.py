@@ -0,0 +1,75 @@
+"""Üyelik indeksi.
+
+Botun gördüğü her kullanıcı için hangi sunucularda olduğu (user_id ->
+{guild_id}) ve görünen adları tutulur: genel ad kullanıcı başına, sunucu
+takma adı yalnızca varsa (guild_id, user_id) başına. İndeks sunucu
+hazır olduğunda üye listesinden kurulur; üye katılma/ayrılma/güncelleme ve
+kullanıcı güncelleme olaylarıyla güncel kalır. Böylece isim çözme ve
+"botla ortak sunucusu var mı" sorusu sunucular taranmadan, tek sözlük
+aramasıyla cevaplanır; kullanıcı o anki sunucuda olmasa da (genel sıralama,
+başka sunucudaki arkadaşlar) adı bulunur.
+"""
+
+
+def _global_name(user):
+    return user.global_name or user.name
+
+
+class MemberIndex:
+    def __init__(self):
+        self._guilds = {}  # user_id -> {guild_id}
+        self._names = {}   # user_id -> genel görünen ad
+        self._nicks = {}   # (guild_id, user_id) -> sunucu takma adı
+
+    def __len__(self):
+        return len(self._guilds)
+
+    # --- sorgular ---
+    def known(self, user_id):
+        """Kullanıcı botla en az bir sunucuyu paylaşıyor mu (DM gönderilebilir mi)"""
+        return user_id in self._guilds
+
+    def display_name(self, user_id, guild=None):
+        """Sunucu takma adı, yoksa genel ad, o da yoksa id"""
+        if guild is not None:
+            nick = self._nicks.get((guild.id, user_id))
+            if nick:
+                return nick
+        return self._names.get(user_id) or str(user_id)
+
+    # --- olaylar ---
+    def add(self, member):
+        self._guilds.setdefault(member.id, set()).add(member.guild.id)
+        self._names[member.id] = _global_name(member)
+        self._set_nick(member.guild.id, member.id, member.nick)
+
+    def remove(self, guild_id, user_id):
+        self._nicks.pop((guild_id, user_id), None)
+        guilds = self._guilds.get(user_id)
+        if guilds is None:
+            return
+        guilds.discard(guild_id)
+        if not guilds:
+            del self._guilds[user_id]
+            self._names.pop(user_id, None)
+
+    def member_updated(self, before, after):
+        self._set_nick(after.guild.id, after.id, after.nick)
+
+    def user_updated(self, before, after):
+        if after.id in self._names:
+            self._names[after.id] = _global_name(after)
+
+    def add_guild(self, guild):
+        for member in guild.members:
+            self.add(member)
+
+    def remove_guild(self, guild):
+        for member in guild.members:
+            self.remove(guild.id, member.id)
+
+    def _set_nick(self, guild_id, user_id, nick):
+        if nick:
+            self._nicks[(guild_id, user_id)] = nick
+        else:
+            self._nicks.pop((guild_id, user_id), None)
@@ -0,0 +1,167 @@
+"""Kapasiteli mentor eşleştirme.
+
+Her mentorun bir kapasitesi vardır; bekleyen istekler ve kabul edilen
+menteeler bu kapasiteden düşer. Mentorlar (doluluk oranı, sıra, mentor_id,
+sürüm) olarak bir min-heap'te tutulur: en boş mentor O(log M)'de bulunur,
+yükü değişen mentor yeni sürümle tekrar eklenir ve eski kayıtlar sırası
+geldiğinde atlanır. Mentorun bir alanı varsa ayrıca o alanın heap'ine de
+girer; alanı bilinen menteeler önce kendi alanındaki mentorlara yönlendirilir.
+
+Bekleyen istekler REQUEST_TIMEOUT içinde kabul edilmezse sweep() onları
+henüz denenmemiş bir sonraki mentora aktarır. Süre takibi yalnızca sweep()
+çalıştıran süreçte açıktır (deadlines=True); diğer süreçlerde süre heap'i
+tutulmaz.
+"""
+import heapq
+import itertools
+import time
+
+DEFAULT_CAPACITY = 3
+REQUEST_TIMEOUT = 48 * 3600  # saniye
+
+
+class MentorMatcher:
+    def __init__(self, state=None, timeout=REQUEST_TIMEOUT, clock=time.time, deadlines=True):
+        self.timeout = timeout
+        self.clock = clock
+        self.deadlines = deadlines
+        self.mentors = {}    # mentor_id -> {"kapasite": int, "alan": str | None}
+        self.requests = {}   # mentee_id -> {"mentor", "deadline", "denenen", "alan", "ad"}
+        self.pairs = {}      # mentee_id -> mentor_id
+        self._load = {}      # mentor_id -> bekleyen + kabul edilen
+        self._version = {}
+        self._heaps = {}     # alan (None = hepsi) -> [(yük / kapasite, sıra, mentor_id, sürüm)]
+        self._deadlines = []  # (deadline, mentee_id, mentor_id)
+        self._seq = itertools.count()
+        self._state = state
+        if state is not None:
+            state.register("mentors", self.mentors)
+            state.register("mentee_requests", self.requests)
+            state.register("mentor_pairs", self.pairs)
+            for name in ("mentors", "mentee_requests", "mentor_pairs"):
+                state.on_reload(name, lambda keys: self.rebuild())
+
+    def _mark(self, name, key):
+        if self._state is not None:
+            self._state.mark_dirty(name, key)
+
+    def _push(self, mentor_id):
+        version = self._version.get(mentor_id, 0) + 1
+        self._version[mentor_id] = version
+        info = self.mentors[mentor_id]
+        entry = (self._load.get(mentor_id, 0) / info["kapasite"], next(self._seq), mentor_id, version)
+        heapq.heappush(self._heaps.setdefault(None, []), entry)
+        alan = info.get("alan")
+        if alan:
+            heapq.heappush(self._heaps.setdefault(alan, []), entry)
+
+    def _change_load(self, mentor_id, delta):
+        self._load[mentor_id] = self._load.get(mentor_id, 0) + delta
+        if mentor_id in self.mentors:
+            self._push(mentor_id)
+
+    def rebuild(self):
+        """state.load() sonrasında heap'leri ve yükleri yeniden kurar"""
+        self._load = {mid: 0 for mid in self.mentors}
+        for mentee_id, mentor_id in self.pairs.items():
+            self._load[mentor_id] = self._load.get(mentor_id, 0) + 1
+        self._deadlines = []
+        for mentee_id, req in self.requests.items():
+            self._load[req["mentor"]] = self._load.get(req["mentor"], 0) + 1
+            if self.deadlines:
+                self._deadlines.append((req["deadline"], mentee_id, req["mentor"]))
+        heapq.heapify(self._deadlines)
+        self._heaps = {}
+        self._version = {}
+        for mentor_id in self.mentors:
+            self._push(mentor_id)
+
+    def add_mentor(self, mentor_id, kapasite=DEFAULT_CAPACITY, alan=None):
+        self.mentors[mentor_id] = {"kapasite": max(1, kapasite), "alan": alan}
+        self._load.setdefault(mentor_id, 0)
+        self._mark("mentors", mentor_id)
+        self._push(mentor_id)
+
+    def is_mentor(self, user_id):
+        return user_id in self.mentors
+
+    def _pick(self, alan, exclude):
+        heap = self._heaps.get(alan)
+        if not heap:
+            return None
+        skipped = []
+        chosen = None
+        while heap:
+            ratio, seq, mentor_id, version = heap[0]
+            if version != self._version.get(mentor_id):
+                heapq.heappop(heap)  # eski kayıt
+                continue
+            if ratio >= 1:
+                # En boş mentor bile doluysa diğerleri de dolu
+                break
+            if mentor_id in exclude:
+                skipped.append(heapq.heappop(heap))
+                continue
+            chosen = mentor_id
+            break
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return chosen
+
+    def _assign(self, mentee_id, alan, exclude):
+        mentor_id = None
+        if alan:
+            mentor_id = self._pick(alan, exclude)
+        if mentor_id is None:
+            mentor_id = self._pick(None, exclude)
+        return mentor_id
+
+    def request(self, mentee_id, alan=None, ad=None):
+        """Mentee'yi uygun bir mentora atar; uygun mentor yoksa None döner"""
+        mentor_id = self._assign(mentee_id, alan, {mentee_id})
+        if mentor_id is None:
+            return None
+        deadline = self.clock() + self.timeout
+        self.requests[mentee_id] = {"mentor": mentor_id, "deadline": deadline, "denenen": [mentor_id],
+                                    "alan": alan, "ad": ad}
+        if self.deadlines:
+            heapq.heappush(self._deadlines, (deadline, mentee_id, mentor_id))
+        self._change_load(mentor_id, 1)
+        self._mark("mentee_requests", mentee_id)
+        return mentor_id
+
+    def accept(self, mentor_id, mentee_id):
+        req = self.requests.get(mentee_id)
+        if req is None or req["mentor"] != mentor_id:
+            return False
+        del self.requests[mentee_id]
+        self.pairs[mentee_id] = mentor_id  # yük aynı kalır: bekleyen -> kabul edilen
+        self._mark("mentee_requests", mentee_id)
+        self._mark("mentor_pairs", mentee_id)
+        return True
+
+    def sweep(self):
+        """Süresi dolan istekleri sıradaki mentora aktarır.
+
+        (mentee_id, yeni mentor_id veya None, istek) listesi döner.
+        """
+        now = self.clock()
+        moved = []
+        while self._deadlines and self._deadlines[0][0] <= now:
+            deadline, mentee_id, mentor_id = heapq.heappop(self._deadlines)
+            req = self.requests.get(mentee_id)
+            if req is None or req["mentor"] != mentor_id or req["deadline"] != deadline:
+                continue
+            self._change_load(mentor_id, -1)
+            new_mentor = self._assign(mentee_id, req["alan"], set(req["denenen"]) | {mentee_id})
+            if new_mentor is None:
+                del self.requests[mentee_id]
+            else:
+                req["mentor"] = new_mentor
+                req["deadline"] = now + self.timeout
+                req["denenen"].append(new_mentor)
+                heapq.heappush(self._deadlines, (req["deadline"], mentee_id, new_mentor))
+                self._change_load(new_mentor, 1)
+            self._mark("mentee_requests", mentee_id)
+            moved.append((mentee_id, new_mentor, req))
+        return moved
@@ -0,0 +1,200 @@
+"""Uygulama metrikleri.
+
+Sayaçlar, gecikme histogramları ve ölçüm anında okunan gauge'lar tek bir
+kayıtta (metrics) tutulur. Etiketler (label) anahtar sözcük olarak verilir:
+
+    metrics.inc("commands_total", command="profil")
+    metrics.observe("db_seconds", 0.002, op="read", query="_fetchone")
+    with metrics.timer("auth_hash_seconds", op="hash"): ...
+    metrics.gauge("logged_in_users", lambda: len(logged_in_users))
+
+render() Prometheus metin biçimini üretir; serve() bunu yerel bir HTTP
+ucunda (/metrics) yayınlar. LagMonitor olay döngüsü gecikmesini örnekler.
+"""
+import asyncio
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+METRICS_HOST = os.environ.get("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("METRICS_PORT", 9108))  # 0 = kapalı
+# Saniye cinsinden histogram sınırları (1 ms - 10 s)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LAG_INTERVAL = 0.5  # saniye
+
+
+def _escape(value):
+    # Prometheus metin biçimi: etiket değerlerinde ters bölü, tırnak ve satır sonu kaçırılır
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # son kova: +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Kova sınırına göre yaklaşık yüzdelik"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(BUCKETS, self.counts):
+            seen += n
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+class Metrics:
+    def __init__(self):
+        self._counters = {}    # (ad, etiketler) -> değer
+        self._histograms = {}  # (ad, etiketler) -> Histogram
+        self._gauges = {}      # ad -> fonksiyon
+
+    def inc(self, name, value=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        hist = self._histograms.get(key)
+        if hist is None:
+            hist = self._histograms[key] = Histogram()
+        hist.observe(seconds)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def gauge(self, name, func):
+        """func() ölçüm anında çağrılır"""
+        self._gauges[name] = func
+
+    def render(self):
+        """Prometheus metin biçimi (0.0.4)"""
+        lines = []
+        typed = set()
+
+        def header(name, kind):
+            if name in typed:
+                return
+            typed.add(name)
+            lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in sorted(self._counters.items()):
+            header(name, "counter")
+            lines.append(f"{name}{_labels(labels)} {value}")
+        for (name, labels), hist in sorted(self._histograms.items(), key=lambda item: item[0]):
+            header(name, "histogram")
+            seen = 0
+            for bound, n in zip(BUCKETS, hist.counts):
+                seen += n
+                lines.append(f"{name}_bucket{_labels(labels + (('le', bound),))} {seen}")
+            lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {hist.count}")
+            lines.append(f"{name}_sum{_labels(labels)} {hist.sum}")
+            lines.append(f"{name}_count{_labels(labels)} {hist.count}")
+        for name, func in sorted(self._gauges.items()):
+            try:
+                value = func()
+            except Exception as e:
+                print(f"Metrik okunamadı ({name}): {e}")
+                continue
+            header(name, "gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self, limit=15):
+        """!metrics için kısa özet: en yavaş histogramlar ve gauge'lar"""
+        rows = sorted(self._histograms.items(), key=lambda item: item[1].quantile(0.99), reverse=True)
+        lines = []
+        for (name, labels), hist in rows[:limit]:
+            avg = hist.sum / hist.count * 1000
+            lines.append(f"{name}{_labels(labels)} n={hist.count} ort={avg:.1f}ms p99<={hist.quantile(0.99) * 1000:g}ms")
+        for name, func in sorted(self._gauges.items()):
+            try:
+                lines.append(f"{name} = {func()}")
+            except Exception:
+                pass
+        return lines
+
+    # --- HTTP ucu ---
+    async def _handle(self, reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=5)
+            while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", self.render().encode()
+            else:
+                status, body = "404 Not Found", b"not found\n"
+            writer.write(f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                         f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=METRICS_HOST, port=METRICS_PORT):
+        """Yerel /metrics ucunu açar; port 0 ise ya da açılamazsa None döner"""
+        if not port:
+            return None
+        try:
+            server = await asyncio.start_server(self._handle, host, port)
+        except OSError as e:
+            # Metrik ucu isteğe bağlı; port doluysa bot metriksiz devam eder
+            print(f"Metrik ucu açılamadı ({host}:{port}): {e}")
+            return None
+        print(f"Metrikler: http://{host}:{port}/metrics")
+        return server
+
+
+class LagMonitor:
+    """Olay döngüsü gecikmesini örnekler (uyanma zamanı - planlanan zaman)"""
+
+    def __init__(self, registry, interval=LAG_INTERVAL):
+        self.registry = registry
+        self.interval = interval
+        self.last = 0.0
+        self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.last = max(0.0, time.perf_counter() - started - self.interval)
+            self.registry.observe("event_loop_lag_seconds", self.last)
+
+    def start(self):
+        if self._task is None:
+            self.registry.gauge("event_loop_lag_last_seconds", lambda: self.last)
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+metrics = Metrics()
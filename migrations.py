@@ -0,0 +1,389 @@
+"""Sürümlü şema göçleri.
+
+Her göç bir sürüm numarasıyla kaydedilir ve sırayla, yalnızca bir kez
+uygulanır. Uygulanan sürümler schema_version tablosunda tutulur. Yeni bir
+değişiklik için mevcut göçleri düzenlemek yerine yeni bir sürüm eklenir.
+"""
+import datetime
+import json
+import re
+import time
+
+MIGRATIONS = []
+
+
+def migration(version):
+    def deco(func):
+        MIGRATIONS.append((version, func))
+        return func
+    return deco
+
+
+def current_version(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    return row[0] or 0
+
+
+def migrate(conn):
+    """Eksik göçleri sırayla uygular; çağıran transaction'ı yönetir"""
+    version = current_version(conn)
+    applied = []
+    for number, func in sorted(MIGRATIONS, key=lambda m: m[0]):
+        if number <= version:
+            continue
+        func(conn)
+        conn.execute('INSERT INTO schema_version (version) VALUES (?)', (number,))
+        applied.append(number)
+    return applied
+
+
+@migration(1)
+def _users_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password BLOB NOT NULL,
+            email TEXT,
+            discord_id INTEGER,
+            quiz_results TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+
+
+@migration(2)
+def _password_blob(conn):
+    # Eski veritabanlarında password TEXT olarak tanımlı; SQLite sütun tipini
+    # değiştiremediği için tablo yeniden oluşturulur (veriler aynen taşınır).
+    conn.execute('''
+        CREATE TABLE users_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password BLOB NOT NULL,
+            email TEXT,
+            discord_id INTEGER,
+            quiz_results TEXT,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('''
+        INSERT INTO users_new (id, username, password, email, discord_id, quiz_results, created_at)
+        SELECT id, username, password, email, discord_id, quiz_results, created_at FROM users
+    ''')
+    conn.execute('DROP TABLE users')
+    conn.execute('ALTER TABLE users_new RENAME TO users')
+
+
+@migration(3)
+def _discord_id_index(conn):
+    # Aynı Discord hesabına bağlı birden fazla kayıt varsa en son kayıt kalır
+    conn.execute('''
+        UPDATE users SET discord_id = NULL
+        WHERE discord_id IS NOT NULL
+          AND id NOT IN (SELECT MAX(id) FROM users WHERE discord_id IS NOT NULL GROUP BY discord_id)
+    ''')
+    conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_users_discord_id ON users(discord_id)')
+
+
+@migration(4)
+def _state_kv_table(conn):
+    # persistence.StateStore'un yazdığı bellek içi durum
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS state_kv (
+            namespace TEXT NOT NULL,
+            key INTEGER NOT NULL,
+            value TEXT,
+            PRIMARY KEY (namespace, key)
+        ) WITHOUT ROWID
+    ''')
+
+
+@migration(5)
+def _activity_scores(conn):
+    # guild_id = 0 genel sıralama; eski user_activity_count kayıtları oraya taşınır
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS activity_scores (
+            guild_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            score INTEGER NOT NULL,
+            PRIMARY KEY (guild_id, user_id)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        INSERT OR REPLACE INTO activity_scores (guild_id, user_id, score)
+        SELECT 0, key, CAST(value AS INTEGER) FROM state_kv WHERE namespace = 'user_activity_count'
+    ''')
+    conn.execute("DELETE FROM state_kv WHERE namespace = 'user_activity_count'")
+
+
+@migration(6)
+def _reminder_deliveries(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS reminder_deliveries (
+            goal_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            sent_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (goal_id, kind)
+        ) WITHOUT ROWID
+    ''')
+
+
+@migration(7)
+def _quiz_history_table(conn):
+    # secim: a=0, b=1, ...; ts: epoch saniye. Sonuç satırlarında soru/secim NULL.
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS quiz_history (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            ts INTEGER NOT NULL,
+            kategori TEXT NOT NULL,
+            soru INTEGER,
+            secim INTEGER,
+            summary TEXT
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_quiz_history_user ON quiz_history(user_id, ts)')
+    rows = []
+    for row in conn.execute("SELECT key, value FROM state_kv WHERE namespace = 'quiz_history'"):
+        for item in json.loads(row[1]):
+            ts = int(datetime.datetime.fromisoformat(item["tarih"]).replace(tzinfo=datetime.timezone.utc).timestamp())
+            if "question" in item:
+                rows.append((row[0], ts, item["kategori"], item["question"], ord(item["choice"]) - ord("a"), None))
+            else:
+                rows.append((row[0], ts, item["kategori"], None, None, item.get("result_summary")))
+    conn.executemany('''
+        INSERT INTO quiz_history (user_id, ts, kategori, soru, secim, summary) VALUES (?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.execute("DELETE FROM state_kv WHERE namespace = 'quiz_history'")
+
+
+@migration(8)
+def _mentor_matching(conn):
+    # mentors: set -> {"kapasite", "alan"}; mentor_requests (mentor -> [mentee])
+    # yerine mentee_requests (mentee -> istek). Bekleyen istekler yeniden süre alır.
+    conn.execute('''
+        UPDATE state_kv SET value = '{"kapasite": 3, "alan": null}'
+        WHERE namespace = 'mentors' AND value IS NULL
+    ''')
+    deadline = time.time() + 48 * 3600
+    rows = []
+    for row in conn.execute("SELECT key, value FROM state_kv WHERE namespace = 'mentor_requests'"):
+        for mentee_id in json.loads(row[1]):
+            req = {"mentor": row[0], "deadline": deadline, "denenen": [row[0]], "alan": None, "ad": None}
+            rows.append(('mentee_requests', mentee_id, json.dumps(req)))
+    conn.executemany('INSERT OR REPLACE INTO state_kv (namespace, key, value) VALUES (?, ?, ?)', rows)
+    conn.execute("DELETE FROM state_kv WHERE namespace = 'mentor_requests'")
+
+
+@migration(9)
+def _friendships_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS friendships (
+            user_id INTEGER NOT NULL,
+            friend_id INTEGER NOT NULL,
+            created_at INTEGER NOT NULL,
+            PRIMARY KEY (user_id, friend_id)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_friendships_friend ON friendships(friend_id, user_id)')
+    now = int(time.time())
+    rows = []
+    for row in conn.execute("SELECT key, value FROM state_kv WHERE namespace = 'friends'"):
+        rows.extend((row[0], friend_id, now) for friend_id in json.loads(row[1]) if friend_id != row[0])
+    conn.executemany('INSERT OR IGNORE INTO friendships (user_id, friend_id, created_at) VALUES (?, ?, ?)', rows)
+    conn.execute("DELETE FROM state_kv WHERE namespace = 'friends'")
+
+
+@migration(10)
+def _change_feed(conn):
+    # Çok süreçli çalışmada süreçler arası önbellek geçersizleştirme (bkz. sharding.py)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS state_changes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            origin TEXT NOT NULL,
+            namespace TEXT NOT NULL,
+            key INTEGER NOT NULL,
+            ts INTEGER NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_state_changes_ts ON state_changes(ts)')
+    # Süreçler arasında çakışmayan id'ler
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS id_sequences (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    last_goal = 0
+    for row in conn.execute("SELECT value FROM state_kv WHERE namespace = 'user_goals'"):
+        last_goal = max([last_goal] + [goal["id"] for goal in json.loads(row[0])])
+    conn.execute("INSERT OR IGNORE INTO id_sequences (name, value) VALUES ('goal', ?)", (last_goal,))
+
+
+@migration(11)
+def _quiz_outcomes(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS quiz_outcomes (
+            id INTEGER PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            guild_id INTEGER NOT NULL,
+            kategori TEXT NOT NULL,
+            ts INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            dil TEXT,
+            uni TEXT,
+            meslek TEXT,
+            alan TEXT
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_quiz_outcomes_user ON quiz_outcomes(user_id, ts)')
+    # Özet: guild_id = 0 tüm sunucuların toplamı
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS quiz_outcome_counts (
+            guild_id INTEGER NOT NULL,
+            kategori TEXT NOT NULL,
+            day TEXT NOT NULL,
+            field TEXT NOT NULL,
+            value TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (guild_id, kategori, day, field, value)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_quiz_outcome_counts_day ON quiz_outcome_counts(guild_id, day)')
+    # Eski sonuçlar yalnızca "Dil: .., Üniversite: .., Meslek: .." metni olarak var; sunucu bilinmiyor
+    pattern = re.compile(r"Dil: (.*), Üniversite: (.*), Meslek: (.*)")
+    rows = []
+    for row in conn.execute('SELECT user_id, kategori, ts, summary FROM quiz_history WHERE summary IS NOT NULL'):
+        match = pattern.fullmatch(row[3])
+        if match:
+            day = datetime.datetime.fromtimestamp(row[2], datetime.timezone.utc).date().isoformat()
+            rows.append((row[0], 0, row[1], row[2], day, *match.groups()))
+    conn.executemany('''
+        INSERT INTO quiz_outcomes (user_id, guild_id, kategori, ts, day, dil, uni, meslek)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    for field in ("dil", "uni", "meslek"):
+        conn.execute(f'''
+            INSERT INTO quiz_outcome_counts (guild_id, kategori, day, field, value, count)
+            SELECT 0, kategori, day, '{field}', {field}, COUNT(*) FROM quiz_outcomes
+            WHERE {field} IS NOT NULL GROUP BY kategori, day, {field}
+        ''')
+
+
+@migration(12)
+def _goals_table(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS goals (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            text TEXT NOT NULL,
+            due_date TEXT,
+            created_at TEXT NOT NULL,
+            completed INTEGER NOT NULL DEFAULT 0,
+            completed_at DATETIME,
+            due_sort TEXT GENERATED ALWAYS AS (COALESCE(due_date, '9999-12-31')) VIRTUAL
+        )
+    ''')
+    # Listeleme sırası: durum, bitiş tarihi (yoksa sona), id (bkz. goals.GoalStore.page)
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_goals_user ON goals(user_id, completed, due_sort, id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_goals_active ON goals(completed) WHERE completed = 0')
+    rows = []
+    for row in conn.execute("SELECT key, value FROM state_kv WHERE namespace = 'user_goals'"):
+        for goal in json.loads(row[1]):
+            rows.append((goal["id"], row[0], goal["text"], goal["due_date"], goal["created_at"], int(goal["completed"])))
+    conn.executemany('''
+        INSERT INTO goals (id, user_id, text, due_date, created_at, completed) VALUES (?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.execute("DELETE FROM state_kv WHERE namespace = 'user_goals'")
+    # Goal id'lerini artık tablo veriyor
+    conn.execute("DELETE FROM id_sequences WHERE name = 'goal'")
+
+
+@migration(13)
+def _resource_catalog(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS resources (
+            id INTEGER PRIMARY KEY,
+            alan TEXT NOT NULL,
+            title TEXT NOT NULL,
+            url TEXT NOT NULL UNIQUE,
+            description TEXT NOT NULL DEFAULT '',
+            tags TEXT NOT NULL DEFAULT '',
+            weight INTEGER NOT NULL DEFAULT 0,
+            updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_resources_alan ON resources(alan, weight DESC)')
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS resources_fts USING fts5(
+            title, description, tags, content='resources', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )
+    ''')
+    # FTS indeksi tetikleyicilerle güncel tutulur
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS resources_ai AFTER INSERT ON resources BEGIN
+            INSERT INTO resources_fts (rowid, title, description, tags) VALUES (new.id, new.title, new.description, new.tags);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS resources_ad AFTER DELETE ON resources BEGIN
+            INSERT INTO resources_fts (resources_fts, rowid, title, description, tags)
+            VALUES ('delete', old.id, old.title, old.description, old.tags);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS resources_au AFTER UPDATE ON resources BEGIN
+            INSERT INTO resources_fts (resources_fts, rowid, title, description, tags)
+            VALUES ('delete', old.id, old.title, old.description, old.tags);
+            INSERT INTO resources_fts (rowid, title, description, tags) VALUES (new.id, new.title, new.description, new.tags);
+        END
+    ''')
+    # Eski sabit resource_bank içeriği
+    conn.executemany('''
+        INSERT OR IGNORE INTO resources (alan, title, url, description, tags, weight) VALUES (?, ?, ?, ?, ?, ?)
+    ''', [
+        ("yazilim", "freeCodeCamp", "https://www.freecodecamp.org",
+         "Ücretsiz interaktif programlama dersleri: web geliştirme, JavaScript, Python",
+         "yazilim,yazılım,mühendislik,programlama,web,javascript,python,başlangıç", 10),
+        ("yazilim", "Python Belgeleri", "https://docs.python.org/3/",
+         "Resmi Python dokümantasyonu ve eğitimi (İngilizce)",
+         "yazilim,yazılım,python,programlama,dokümantasyon,ingilizce,ileri", 5),
+        ("veribilim", "Kaggle", "https://www.kaggle.com",
+         "Veri bilimi yarışmaları, veri setleri ve ücretsiz mikro kurslar",
+         "veribilim,veri,makine öğrenmesi,python,pandas,yarışma", 10),
+        ("veribilim", "scikit-learn", "https://scikit-learn.org",
+         "Python ile makine öğrenmesi kütüphanesi ve kullanım kılavuzu",
+         "veribilim,veri,makine öğrenmesi,python,sklearn,ileri", 5),
+        ("pazarlama", "Moz SEO Rehberi", "https://moz.com/learn/seo",
+         "Arama motoru optimizasyonunun temelleri",
+         "pazarlama,dijital pazarlama,seo,arama motoru", 10),
+        ("pazarlama", "HubSpot Kaynakları", "https://www.hubspot.com/resources",
+         "İçerik pazarlama, sosyal medya ve reklam rehberleri",
+         "pazarlama,dijital pazarlama,sosyal medya,reklam,içerik", 5),
+        ("tasarim", "Figma ile Tasarım Öğren", "https://www.figma.com/resources/learn-design/",
+         "Arayüz ve UX tasarımının temelleri, Figma eğitimleri",
+         "tasarim,tasarım,sanat,ux,arayüz,figma", 10),
+        ("tasarim", "Behance", "https://www.behance.net",
+         "Tasarım portfolyoları ve ilham",
+         "tasarim,tasarım,sanat,portfolyo,ilham", 5),
+        ("girisim", "Y Combinator Kütüphanesi", "https://www.ycombinator.com/library",
+         "Girişimcilik, iş planı ve müşteri doğrulama üzerine yazılar ve videolar",
+         "girisim,girişim,girişimcilik,iş planı,startup,sosyal bilimler", 10),
+        ("girisim", "Harvard Business Review", "https://hbr.org",
+         "Yönetim, liderlik ve iş dünyası makaleleri",
+         "girisim,girişim,yönetim,liderlik,iş,sosyal bilimler,ingilizce", 5),
+    ])
+
+
+@migration(14)
+def _drop_id_sequences(conn):
+    # Goal id'lerini göç 12'den beri goals tablosu (AUTOINCREMENT) veriyor; başka kullanıcısı yok
+    conn.execute('DROP TABLE IF EXISTS id_sequences')
@@ -0,0 +1,98 @@
+"""Sayfalı liste çıktıları.
+
+Bir Paginator satırları kaynağından sayfa sayfa çeker:
+
+    async def fetch(key, cursor, limit) -> (satırlar, sonraki cursor | None)
+    def render(guild, key, satırlar, sayfa_no) -> metin
+
+cursor, sayfanın nereden başlayacağını söyleyen küçük bir demettir ve
+"Sonraki" butonunun custom_id'sine yazılır (ad:sahip:key:sayfa:cursor...);
+bu yüzden butonlar bot yeniden başlasa da çalışır ve bellekte mesaj başına
+durum tutulmaz. Tıklamalar on_interaction -> router ile gelir; gönderilen
+View yalnızca butonları taşır ve kısa bir süre sonra discord.py'nin view
+deposundan düşer (VIEW_TIMEOUT), böylece her sayfa için bir View birikmez. Yalnızca görüntülenen sayfa çekilir ve isimler yalnızca o
+sayfa için çözülür. Çizilen sayfalar kısa bir süre önbellekte tutulur;
+aynı sayfayı açan diğer kullanıcılar kaynağa tekrar gitmez.
+"""
+import time
+from collections import OrderedDict
+
+import discord
+from discord.ui import Button, View
+
+from router import custom_id
+
+PAGE_SIZE = 10
+CACHE_TTL = 30      # saniye
+CACHE_SIZE = 256
+MAX_MESSAGE = 2000
+ANYONE = 0          # sahip 0 ise herkes sayfa değiştirebilir
+VIEW_TIMEOUT = 5    # saniye; butonlar bundan sonra da router üzerinden çalışır
+
+
+class Paginator:
+    def __init__(self, router, name, fetch, render, page_size=PAGE_SIZE,
+                 cache_ttl=CACHE_TTL, cache_size=CACHE_SIZE, clock=time.monotonic):
+        self.name = name
+        self.fetch = fetch
+        self.render = render
+        self.page_size = page_size
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.clock = clock
+        self._cache = OrderedDict()  # (key, guild_id, cursor) -> (son geçerlilik, metin, sonraki cursor)
+
+        async def handler(interaction, owner, key, page_no, *cursor):
+            await self._on_click(interaction, int(owner), int(key), int(page_no), cursor or None)
+        handler.__name__ = f"{name}_page"
+        router.prefix(name)(handler)
+
+    def invalidate(self, key):
+        """key'e ait önbellekteki sayfaları atar (kaynak değiştiğinde)"""
+        for cache_key in [k for k in self._cache if k[0] == key]:
+            del self._cache[cache_key]
+
+    async def _page(self, guild, key, page_no, cursor):
+        # Cursor custom_id'den metin olarak gelir; önbellek anahtarı da metin
+        cursor = tuple(map(str, cursor)) if cursor else None
+        cache_key = (key, guild.id if guild else None, cursor)
+        now = self.clock()
+        cached = self._cache.get(cache_key)
+        if cached is not None and cached[0] > now:
+            self._cache.move_to_end(cache_key)
+            return cached[1], cached[2]
+        rows, next_cursor = await self.fetch(key, cursor, self.page_size)
+        text = self.render(guild, key, rows, page_no) if rows else ""
+        self._cache[cache_key] = (now + self.cache_ttl, text, next_cursor)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return text, next_cursor
+
+    def _view(self, owner, key, page_no, next_cursor):
+        if page_no == 1 and next_cursor is None:
+            return None
+        view = View(timeout=VIEW_TIMEOUT)
+        if page_no > 1:
+            view.add_item(Button(label="İlk sayfa", style=discord.ButtonStyle.secondary,
+                                 custom_id=custom_id(self.name, owner, key, 1)))
+        if next_cursor is not None:
+            view.add_item(Button(label="Sonraki", style=discord.ButtonStyle.primary,
+                                 custom_id=custom_id(self.name, owner, key, page_no + 1, *next_cursor)))
+        return view
+
+    async def send(self, ctx, key, owner=ANYONE, empty="Gösterilecek kayıt yok.", header="", footer=""):
+        """İlk sayfayı gönderir; header/footer yalnızca bu mesajda görünür"""
+        text, next_cursor = await self._page(ctx.guild, key, 1, None)
+        if not text:
+            await ctx.send(empty)
+            return
+        content = f"{header}{text}{footer}"[:MAX_MESSAGE]
+        await ctx.send(content, view=self._view(owner, key, 1, next_cursor))
+
+    async def _on_click(self, interaction, owner, key, page_no, cursor):
+        if owner != ANYONE and interaction.user.id != owner:
+            await interaction.response.send_message("Bu liste size ait değil.", ephemeral=True)
+            return
+        text, next_cursor = await self._page(interaction.guild, key, page_no, cursor)
+        await interaction.response.edit_message(content=(text or "Başka kayıt yok.")[:MAX_MESSAGE],
+                                                view=self._view(owner, key, page_no, next_cursor))
@@ -0,0 +1,184 @@
+"""Bellekteki bot durumunun gecikmeli (write-behind) kalıcılığı.
+
+Komutlar yalnızca bellekteki yapıları değiştirir ve değişen anahtarı
+state.mark_dirty(ad, anahtar) ile işaretler. Kirli anahtarlar belirli
+aralıklarla ya da sayıları eşiği aştığında tek transaction içinde state_kv
+tablosuna yazılır. Başlangıçta tüm tablo tek sorguyla geri yüklenir,
+kapanışta bekleyen her şey yazılır.
+
+Kendi tablosunu kullanan alt sistemler add_source() ile aynı flush turuna
+katılabilir; topladıkları satırlar state_kv yazımıyla aynı transaction'da
+yazılır.
+
+Bir ChangeFeed verilirse (bkz. sharding.py) değişen anahtarlar state_changes
+tablosuna da yazılır ve diğer süreçlerin değiştirdiği anahtarlar kayıtlı
+yapılara yeniden yüklenir; on_reload() ile yükleme sonrası çağrılacak bir
+fonksiyon eklenebilir.
+"""
+import asyncio
+import json
+
+FLUSH_INTERVAL = 5.0     # saniye
+FLUSH_THRESHOLD = 500    # bu kadar kirli anahtar birikince beklemeden yaz
+
+
+def _write_rows(conn, upserts, deletes, batches):
+    if upserts:
+        conn.executemany('INSERT OR REPLACE INTO state_kv (namespace, key, value) VALUES (?, ?, ?)', upserts)
+    if deletes:
+        conn.executemany('DELETE FROM state_kv WHERE namespace = ? AND key = ?', deletes)
+    for sql, rows in batches:
+        conn.executemany(sql, rows)
+
+
+def _identity(value):
+    return value
+
+
+class StateStore:
+    def __init__(self, db, flush_interval=FLUSH_INTERVAL, flush_threshold=FLUSH_THRESHOLD, feed=None):
+        self.db = db
+        self.feed = feed
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._registry = {}  # ad -> (yapı, encode, decode)
+        self._dirty = set()  # (ad, anahtar)
+        self._sources = []  # (collect, restore, changes)
+        self._after = {}  # ad -> [yeniden yükleme sonrası fonksiyonlar]
+        self._wake = None
+        self._task = None
+        self._lock = asyncio.Lock()  # flush'lar sırayla; flush() dönünce önceki yazımlar da bitmiştir
+
+    def register(self, name, container, encode=_identity, decode=_identity):
+        """dict veya set türünde bir yapıyı kalıcı hale getirir"""
+        self._registry[name] = (container, encode, decode)
+        if self.feed is not None:
+            self.feed.on(name, lambda keys: self._reload(name, keys))
+
+    def add_source(self, collect, restore=None, changes=None):
+        """collect() -> [(sql, satırlar), ...]; yazılamazsa restore(batches) çağrılır.
+
+        changes(batches) -> [(namespace, anahtar), ...] değişiklik akışına yazılır.
+        """
+        self._sources.append((collect, restore, changes))
+
+    def on_reload(self, name, callback):
+        """callback(anahtarlar): başka süreçte değişen anahtarlar yüklendikten sonra"""
+        self._after.setdefault(name, []).append(callback)
+
+    def mark_dirty(self, name, key):
+        self._dirty.add((name, key))
+        if len(self._dirty) >= self.flush_threshold and self._wake is not None:
+            self._wake.set()
+
+    def pending(self):
+        return len(self._dirty)
+
+    async def load(self):
+        rows = await self.db.fetchall('SELECT namespace, key, value FROM state_kv')
+        for row in rows:
+            entry = self._registry.get(row['namespace'])
+            if entry is None:
+                continue
+            container, encode, decode = entry
+            if isinstance(container, set):
+                container.add(row['key'])
+            else:
+                container[row['key']] = decode(json.loads(row['value']))
+        return len(rows)
+
+    async def _reload(self, name, keys):
+        # Yerelde yazılmayı bekleyen anahtarlar zaten bir sonraki flush'ta yazılacak
+        keys = [key for key in keys if (name, key) not in self._dirty]
+        if not keys:
+            return
+        container, encode, decode = self._registry[name]
+        found = {}
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = await self.db.fetchall(
+                f'SELECT key, value FROM state_kv WHERE namespace = ? AND key IN ({",".join("?" * len(chunk))})',
+                (name, *chunk))
+            found.update((row['key'], row['value']) for row in rows)
+        for key in keys:
+            if isinstance(container, set):
+                if key in found:
+                    container.add(key)
+                else:
+                    container.discard(key)
+            elif key in found:
+                container[key] = decode(json.loads(found[key]))
+            else:
+                container.pop(key, None)
+        for callback in self._after.get(name, ()):
+            callback(keys)
+
+    async def flush(self):
+        async with self._lock:
+            return await self._flush()
+
+    async def _flush(self):
+        collected = [(restore, changes, collect()) for collect, restore, changes in self._sources]
+        batches = [batch for restore, changes, source_batches in collected for batch in source_batches]
+        if not self._dirty and not batches:
+            return 0
+        dirty, self._dirty = self._dirty, set()
+        upserts = []
+        deletes = []
+        # Değerler olay döngüsünde serileştirilir; yazıcı thread'i yalnızca hazır satırları görür
+        for name, key in dirty:
+            entry = self._registry.get(name)
+            if entry is None:
+                continue
+            container, encode, decode = entry
+            if isinstance(container, set):
+                if key in container:
+                    upserts.append((name, key, None))
+                else:
+                    deletes.append((name, key))
+            elif key in container:
+                upserts.append((name, key, json.dumps(encode(container[key]), ensure_ascii=False)))
+            else:
+                deletes.append((name, key))
+        if self.feed is not None:
+            feed_keys = [(name, key) for name, key in dirty if name in self._registry]
+            for restore, changes, source_batches in collected:
+                if changes is not None and source_batches:
+                    feed_keys.extend(changes(source_batches))
+            if feed_keys:
+                batches.append(self.feed.batch(feed_keys))
+        try:
+            await self.db.write(_write_rows, upserts, deletes, batches)
+        except Exception as e:
+            # Yazılamayan anahtarlar bir sonraki turda tekrar denenir
+            self._dirty |= dirty
+            for restore, changes, source_batches in collected:
+                if restore is not None and source_batches:
+                    restore(source_batches)
+            print(f"Durum kaydedilemedi: {e}")
+            return 0
+        return len(upserts) + len(deletes) + sum(len(rows) for sql, rows in batches)
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
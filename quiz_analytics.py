@@ -0,0 +1,100 @@
+"""Quiz sonuç istatistikleri.
+
+Her tamamlanan quiz yapılandırılmış bir kayıt olarak quiz_outcomes
+tablosuna yazılır ve aynı anda quiz_outcome_counts özet tablosundaki
+(sunucu, kategori, gün, alan adı, değer) sayaçları artırılır; genel
+toplamlar guild_id = 0 altında tutulur. Sorgular yalnızca özet tablodan
+okunur, geçmiş taranmaz. Yazımlar StateStore flush'ı ile toplu yapılır;
+sayaçlar fark olarak eklendiği için birden fazla süreç aynı tabloyu
+paylaşabilir.
+"""
+import csv
+import datetime
+import io
+import time
+
+GLOBAL = 0
+FIELDS = ("dil", "uni", "meslek", "alan")
+FIELD_NAMES = {"dil": "Dil", "uni": "Üniversite", "meslek": "Meslek", "alan": "Alan"}
+
+
+class QuizAnalytics:
+    def __init__(self):
+        self._outcomes = []  # yazılmamış quiz_outcomes satırları
+        self._counts = {}    # (guild_id, kategori, gün, alan adı, değer) -> yazılmamış artış
+
+    def record(self, user_id, guild_id, kategori, sonuc):
+        ts = int(time.time())
+        day = datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).date().isoformat()
+        values = [sonuc.get(field) for field in FIELDS]
+        self._outcomes.append((user_id, guild_id or GLOBAL, kategori, ts, day, *values))
+        guilds = (GLOBAL, guild_id) if guild_id else (GLOBAL,)
+        for gid in guilds:
+            for field, value in zip(FIELDS, values):
+                if value is None:
+                    continue
+                key = (gid, kategori, day, field, value)
+                self._counts[key] = self._counts.get(key, 0) + 1
+
+    async def summary(self, db, guild_id=None, kategori=None, days=30):
+        """{alan adı: [(değer, adet), ...]} en sık önce; son `days` gün"""
+        since = (datetime.datetime.now(datetime.timezone.utc).date() - datetime.timedelta(days=days - 1)).isoformat()
+        gid = guild_id or GLOBAL
+        sql = 'SELECT field, value, SUM(count) AS n FROM quiz_outcome_counts WHERE guild_id = ? AND day >= ?'
+        params = [gid, since]
+        if kategori:
+            sql += ' AND kategori = ?'
+            params.append(kategori)
+        rows = await db.fetchall(sql + ' GROUP BY field, value', params)
+        totals = {}
+        for row in rows:
+            totals[(row['field'], row['value'])] = row['n']
+        # Henüz yazılmamış artışlar da sayılır
+        for (g, k, day, field, value), n in self._counts.items():
+            if g == gid and day >= since and (not kategori or k == kategori):
+                totals[(field, value)] = totals.get((field, value), 0) + n
+        result = {field: [] for field in FIELDS}
+        for (field, value), n in totals.items():
+            result.setdefault(field, []).append((value, n))
+        for items in result.values():
+            items.sort(key=lambda item: item[1], reverse=True)
+        return result
+
+    async def export_csv(self, db, guild_id=None, days=30):
+        """Günlük özet satırları (gün, kategori, alan adı, değer, adet) CSV olarak"""
+        since = (datetime.datetime.now(datetime.timezone.utc).date() - datetime.timedelta(days=days - 1)).isoformat()
+        rows = await db.fetchall('''
+            SELECT day, kategori, field, value, count FROM quiz_outcome_counts
+            WHERE guild_id = ? AND day >= ? ORDER BY day, kategori, field, count DESC
+        ''', (guild_id or GLOBAL, since))
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(("gun", "kategori", "alan", "deger", "adet"))
+        writer.writerows(tuple(row) for row in rows)
+        return out.getvalue()
+
+    # --- StateStore kaynağı ---
+    def collect(self):
+        batches = []
+        if self._outcomes:
+            rows, self._outcomes = self._outcomes, []
+            batches.append(('''
+                INSERT INTO quiz_outcomes (user_id, guild_id, kategori, ts, day, dil, uni, meslek, alan)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows))
+        if self._counts:
+            counts, self._counts = self._counts, {}
+            batches.append(('''
+                INSERT INTO quiz_outcome_counts (guild_id, kategori, day, field, value, count) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (guild_id, kategori, day, field, value) DO UPDATE SET count = count + excluded.count
+            ''', [(*key, n) for key, n in counts.items()]))
+        return batches
+
+    def restore(self, batches):
+        for sql, rows in batches:
+            if 'quiz_outcome_counts' in sql:
+                for *key, n in rows:
+                    key = tuple(key)
+                    self._counts[key] = self._counts.get(key, 0) + n
+            else:
+                self._outcomes[:0] = rows
@@ -0,0 +1,111 @@
+"""Veri dosyasından tanımlanan quizler.
+
+Sorular, seçenekler ve puanlama tablosu quizzes.json'da durur. Başlangıçta
+her (kategori, soru) için bir View bir kez oluşturulur ve bot.add_view ile
+kalıcı olarak kaydedilir; butonlara basıldığında yeni View kurulmaz.
+Sonuç, her puanlama kuralının tablosundan cevaba karşılık gelen alanların
+okunmasıyla hesaplanır.
+
+Örnek puanlama kuralı:
+    {"soru": 1, "varsayilan": "d", "tablo": {"a": {"dil": "İleri Seviye"}, "d": {...}}}
+
+Sonuç mesajında hangi alanların hangi etiketle gösterileceği sonuc_alanlari
+ile verilir ("ozet" verilmezse kayıtlı özet de "etiket"i kullanır):
+    "sonuc_alanlari": [{"ad": "uni", "etiket": "Önerilen Üniversite", "ozet": "Üniversite"}]
+Verilmezse puanlama tablolarındaki alanlar (rol ve alan hariç) adlarıyla
+gösterilir. Sonuçta olmayan alanlar atlanır.
+"""
+import json
+import os
+
+import discord
+from discord.ui import Button, View
+
+from router import custom_id
+
+QUIZ_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "quizzes.json")
+HIDDEN_FIELDS = ("rol", "alan")  # rol verme ve kaynak/mentor eşleştirmede kullanılır, gösterilmez
+
+
+def _result_fields(data, puanlama):
+    """[(alan adı, etiket, özet etiketi)]"""
+    if "sonuc_alanlari" in data:
+        return [(f["ad"], f["etiket"], f.get("ozet", f["etiket"])) for f in data["sonuc_alanlari"]]
+    names = {}
+    for soru_no, tablo, varsayilan in puanlama:
+        for fields in tablo.values():
+            names.update(dict.fromkeys(name for name in fields if name not in HIDDEN_FIELDS))
+    return [(name, name.capitalize(), name.capitalize()) for name in names]
+
+
+class Quiz:
+    __slots__ = ("kategori", "baslik", "sorular", "puanlama", "sonuc_alanlari", "secenekler", "views")
+
+    def __init__(self, kategori, data):
+        self.kategori = kategori
+        self.baslik = data.get("baslik", kategori)
+        self.sorular = data["sorular"]
+        # (soru numarası, {seçenek kodu -> sonuç alanları}, varsayılan kod)
+        self.puanlama = [(rule["soru"], rule["tablo"], rule.get("varsayilan")) for rule in data["puanlama"]]
+        self.sonuc_alanlari = _result_fields(data, self.puanlama)
+        # soru numarası - 1 -> {seçenek kodu: sıra}; geçmişe kod yerine sıra yazılır
+        self.secenekler = [{s["kod"]: i for i, s in enumerate(soru["secenekler"])} for soru in self.sorular]
+        self.views = {}
+
+    def __len__(self):
+        return len(self.sorular)
+
+    def prompt(self, soru_no):
+        return f"{soru_no}. soru: {self.sorular[soru_no - 1]['metin']}"
+
+    def choice_index(self, soru_no, kod):
+        """Seçeneğin sorudaki sırası; bilinmeyen kod için None"""
+        return self.secenekler[soru_no - 1].get(kod)
+
+    def score(self, cevaplar):
+        """cevaplar: {soru_no: seçenek kodu}"""
+        sonuc = {}
+        for soru_no, tablo, varsayilan in self.puanlama:
+            sonuc.update(tablo.get(cevaplar.get(soru_no)) or tablo.get(varsayilan, {}))
+        return sonuc
+
+    def summary(self, sonuc):
+        """Profilde saklanan tek satırlık özet
+
+        >>> quiz = Quiz("hobi", {"sorular": [{"metin": "?", "secenekler": []}],
+        ...     "puanlama": [{"soru": 1, "tablo": {"a": {"hobi": "Resim", "rol": "Sanatçı"}}}]})
+        >>> quiz.summary(quiz.score({1: "a"}))
+        'Hobi: Resim'
+        >>> quiz.report(quiz.score({1: "b"}))
+        ''
+        """
+        return ", ".join(f"{ozet}: {sonuc[ad]}" for ad, etiket, ozet in self.sonuc_alanlari if sonuc.get(ad))
+
+    def report(self, sonuc):
+        """Quiz sonunda gösterilen satırlar"""
+        return "\n".join(f"{etiket}: {sonuc[ad]}" for ad, etiket, ozet in self.sonuc_alanlari if sonuc.get(ad))
+
+
+class QuizEngine:
+    def __init__(self, path=QUIZ_FILE):
+        self.path = path
+        self.quizzes = {}
+
+    def load(self):
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        self.quizzes = {kategori: Quiz(kategori, q) for kategori, q in data.items()}
+
+    def compile(self, bot):
+        """Her soru için View'ı bir kez oluşturup kalıcı view olarak kaydeder"""
+        for quiz in self.quizzes.values():
+            for soru_no, soru in enumerate(quiz.sorular, start=1):
+                view = View(timeout=None)
+                for secenek in soru["secenekler"]:
+                    view.add_item(Button(label=secenek["etiket"], style=discord.ButtonStyle.primary,
+                                         custom_id=custom_id("quiz", quiz.kategori, soru_no, secenek["kod"])))
+                quiz.views[soru_no] = view
+                bot.add_view(view)
+
+    def get(self, kategori):
+        return self.quizzes.get(kategori)
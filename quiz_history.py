@@ -0,0 +1,41 @@
+"""Quiz geçmişi.
+
+Cevaplar ve sonuçlar bellekte tutulmaz; StateStore flush'ıyla toplu olarak
+quiz_history tablosuna yazılana kadar yalnızca yazılmamış satırlar
+bekletilir. Seçim, sorunun seçenek listesindeki sırası (0, 1, ...) olarak
+saklanır; böylece seçenek kodları ("a", "evet", "a1") ne olursa olsun tablo
+tamsayı tutar. Toplam sayılar tablodan okunur.
+"""
+import sys
+import time
+
+
+class QuizHistory:
+    def __init__(self, db):
+        self.db = db
+        self._pending = []  # henüz yazılmamış satırlar
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add_answer(self, user_id, kategori, soru, secim_index):
+        """secim_index: Quiz.choice_index() (bilinmeyen kod için None)"""
+        self._pending.append((user_id, int(time.time()), sys.intern(kategori), soru, secim_index, None))
+
+    def add_result(self, user_id, kategori, summary):
+        self._pending.append((user_id, int(time.time()), sys.intern(kategori), None, None, summary))
+
+    async def count(self, user_id):
+        row = await self.db.fetchone('SELECT COUNT(*) FROM quiz_history WHERE user_id = ?', (user_id,))
+        return row[0] + sum(1 for pending in self._pending if pending[0] == user_id)
+
+    # --- StateStore kaynağı ---
+    def collect(self):
+        if not self._pending:
+            return []
+        rows, self._pending = self._pending, []
+        return [('INSERT INTO quiz_history (user_id, ts, kategori, soru, secim, summary) VALUES (?, ?, ?, ?, ?, ?)', rows)]
+
+    def restore(self, batches):
+        for sql, rows in batches:
+            self._pending[:0] = rows
@@ -0,0 +1,96 @@
+"""Devam eden quiz oturumları.
+
+Her oturum (kullanıcı, kategori) için tutulur ve sıradaki soruyu bilir:
+1. soruya verilen cevap oturumu (yeniden) başlatır, diğer sorular yalnızca
+sırası geldiğinde kabul edilir. Puanlama yalnızca oturumdaki cevapları
+kullanır; başka bir quiz ya da yarım kalmış eski bir deneme sonucu
+etkilemez. Oturumlar son kullanım sırasına göre tutulduğu için zamanlayıcı
+ile çalışan temizlik yalnızca süresi dolanlara dokunur.
+"""
+import sys
+import time
+from collections import OrderedDict
+
+IDLE_TIMEOUT = 15 * 60  # saniye
+MAX_SESSIONS = 20000
+# Bellek tahmini için: OrderedDict girdisi + (user_id, kategori) anahtarı, cevap başına dict girdisi
+ENTRY_OVERHEAD = 120
+ANSWER_BYTES = 100
+
+
+class QuizSession:
+    __slots__ = ("user_id", "kategori", "step", "total", "answers", "last_active")
+
+    def __init__(self, user_id, kategori, total, now):
+        self.user_id = user_id
+        self.kategori = kategori
+        self.step = 1        # cevap beklenen soru
+        self.total = total
+        self.answers = {}    # soru_no -> seçim
+        self.last_active = now
+
+    @property
+    def finished(self):
+        return self.step > self.total
+
+
+class QuizSessions:
+    def __init__(self, idle_timeout=IDLE_TIMEOUT, max_sessions=MAX_SESSIONS, clock=time.monotonic):
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.clock = clock
+        self._sessions = OrderedDict()  # (user_id, kategori) -> QuizSession
+        self._answers = 0               # bellek hesabı için toplam cevap sayısı
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _remove(self, key):
+        session = self._sessions.pop(key)
+        self._answers -= len(session.answers)
+
+    def answer(self, user_id, kategori, total, soru_no, secim):
+        """Cevabı işler; soru sıra dışıysa None döner"""
+        key = (user_id, kategori)
+        now = self.clock()
+        if soru_no == 1:
+            if key in self._sessions:
+                self._remove(key)
+            session = self._sessions[key] = QuizSession(user_id, kategori, total, now)
+            if len(self._sessions) > self.max_sessions:
+                self._remove(next(iter(self._sessions)))
+        else:
+            session = self._sessions.get(key)
+            if session is None or session.step != soru_no or now - session.last_active > self.idle_timeout:
+                return None
+            self._sessions.move_to_end(key)
+        session.answers[soru_no] = secim
+        self._answers += 1
+        session.step += 1
+        session.last_active = now
+        return session
+
+    def finish(self, session):
+        key = (session.user_id, session.kategori)
+        if self._sessions.get(key) is session:
+            self._remove(key)
+
+    def sweep(self):
+        """Boşta kalma süresi dolan oturumları siler"""
+        now = self.clock()
+        removed = 0
+        while self._sessions:
+            key, session = next(iter(self._sessions.items()))
+            if now - session.last_active <= self.idle_timeout:
+                break
+            self._remove(key)
+            removed += 1
+        return removed
+
+    def memory_bytes(self):
+        """Oturumların yaklaşık bellek kullanımı"""
+        if not self._sessions:
+            return 0
+        sample = next(iter(self._sessions.values()))
+        per_session = sys.getsizeof(sample) + sys.getsizeof(sample.answers) + ENTRY_OVERHEAD
+        return len(self._sessions) * per_session + self._answers * ANSWER_BYTES
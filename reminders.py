@@ -0,0 +1,108 @@
+"""Hedef bitiş tarihine göre sıralı hatırlatma zamanlayıcısı.
+
+Her aktif hedef için iki hatırlatma vardır: bitişten bir gün önce ("bir_gun")
+ve bitiş günü ("son_gun"). Hatırlatmalar (zaman, goal_id, tür) olarak bir
+min-heap'te tutulur; zamanlayıcı sıradaki hatırlatmaya kadar uyur ve yeni
+bir hedef eklendiğinde uyandırılır. Tamamlanan ya da silinen hedefler
+heap'ten hemen çıkarılmaz, sırası geldiğinde atlanır. Gönderilen
+hatırlatmalar reminder_deliveries tablosuna yazıldığı için yeniden
+başlatmada aynı mesaj tekrar gitmez.
+"""
+import asyncio
+import datetime
+import heapq
+
+REMINDER_HOUR = 9  # hatırlatmaların gönderildiği saat (yerel)
+
+MESSAGES = {
+    "bir_gun": "Hedefinize 1 gün kaldı: {text}",
+    "son_gun": "Hedefinizin son günü: {text}",
+}
+
+
+def _fire_times(due):
+    yield "bir_gun", due - datetime.timedelta(days=1)
+    yield "son_gun", due
+
+
+class ReminderScheduler:
+    def __init__(self, db, send, clock=datetime.datetime.now):
+        self.db = db
+        self.send = send  # send(user_id, mesaj): DM kuyruğuna ekler
+        self.clock = clock
+        self._heap = []     # (zaman, goal_id, tür)
+        self._goals = {}    # goal_id -> (user_id, text)
+        self._sent = set()  # (goal_id, tür)
+        self._wake = None
+        self._task = None
+
+    def __len__(self):
+        return len(self._goals)
+
+    def schedule(self, goal):
+        due = goal.due_date
+        if not due or goal.completed:
+            return
+        now = self.clock()
+        self._goals[goal.id] = (goal.user_id, goal.text)
+        for kind, day in _fire_times(due):
+            if (goal.id, kind) in self._sent:
+                continue
+            # Bot o gün kapalıysa hatırlatma gün içinde gecikmeli gider, ertesi gün gitmez
+            if now.date() > day:
+                continue
+            at = max(datetime.datetime.combine(day, datetime.time(REMINDER_HOUR)), now)
+            heapq.heappush(self._heap, (at, goal.id, kind))
+        if self._wake is not None:
+            self._wake.set()
+
+    def cancel(self, goal_id):
+        self._goals.pop(goal_id, None)
+
+    async def load(self, goals):
+        rows = await self.db.fetchall('SELECT goal_id, kind FROM reminder_deliveries')
+        self._sent = {(row['goal_id'], row['kind']) for row in rows}
+        for goal in goals:
+            self.schedule(goal)
+
+    async def _deliver(self, goal_id, kind):
+        user_id, text = self._goals[goal_id]
+        self._sent.add((goal_id, kind))
+        await self.db.execute('INSERT OR IGNORE INTO reminder_deliveries (goal_id, kind) VALUES (?, ?)',
+                              (goal_id, kind))
+        self.send(user_id, MESSAGES[kind].format(text=text))
+
+    async def _run(self):
+        while True:
+            # Geçersiz kalan kayıtları at
+            while self._heap and (self._heap[0][1] not in self._goals
+                                  or (self._heap[0][1], self._heap[0][2]) in self._sent):
+                heapq.heappop(self._heap)
+            self._wake.clear()
+            if not self._heap:
+                await self._wake.wait()
+                continue
+            delay = (self._heap[0][0] - self.clock()).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            at, goal_id, kind = heapq.heappop(self._heap)
+            if self.clock().date() > at.date():
+                continue
+            try:
+                await self._deliver(goal_id, kind)
+            except Exception as e:
+                print(f"Hatırlatma gönderilemedi: {e}")
+
+    def start(self):
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,148 @@
+"""Kaynak kataloğu.
+
+Kaynaklar resources tablosunda alan ve etiketlerle tutulur; başlık, açıklama
+ve etiketler resources_fts (FTS5, external content) ile indekslenir, indeks
+tetikleyicilerle güncel kalır. search() serbest metin araması yapar (bm25),
+recommend() quiz sonucundaki alanla eşleşen kaynakları öne alıp meslek ve
+dil düzeyi kelimelerine göre sıralar. Sık sorulan sonuçlar bellekte bir LRU
+önbellekte tutulur; katalog değişince (bu süreçte ya da değişiklik akışıyla
+başka bir süreçte) önbellek boşaltılır.
+"""
+import re
+import unicodedata
+from collections import OrderedDict
+
+CACHE_SIZE = 256
+DEFAULT_LIMIT = 5
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def _fold(text):
+    """İndeksin (unicode61 remove_diacritics 2) yaptığı gibi küçük harfe çevirip
+    aksanları atar. lower() "İ"yi "i" + U+0307'ye çevirip kelimeyi böldüğü için
+    casefold sonrası birleşen işaretler silinir; "ı" olduğu gibi kalır (indeks de
+    katlamaz)."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+
+def _fts_query(text, op=" "):
+    """Kullanıcı metnini güvenli bir FTS5 sorgusuna çevirir.
+
+    Kelimeler önek eşleşmelidir; tek harfli kelimeler neredeyse her şeyle
+    eşleşmesin diye tam eşleşme aranır.
+
+    >>> _fts_query('İleri Seviye')
+    '"ileri"* "seviye"*'
+    >>> _fts_query('İNGİLİZCE ve C', " OR ")
+    '"ingilizce"* OR "ve"* OR "c"'
+    """
+    words = _WORD.findall(_fold(text))
+    return op.join(f'"{word}"*' if len(word) > 1 else f'"{word}"' for word in words)
+
+
+class Resource:
+    __slots__ = ("id", "alan", "title", "url", "description", "tags")
+
+    def __init__(self, row):
+        self.id = row['id']
+        self.alan = row['alan']
+        self.title = row['title']
+        self.url = row['url']
+        self.description = row['description']
+        self.tags = row['tags']
+
+    def line(self):
+        return f"{self.title}: {self.url}"
+
+
+def _insert(conn, alan, title, url, description, tags, changes):
+    resource_id = conn.execute('''
+        INSERT INTO resources (alan, title, url, description, tags) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (url) DO UPDATE SET alan = excluded.alan, title = excluded.title,
+            description = excluded.description, tags = excluded.tags, updated_at = CURRENT_TIMESTAMP
+        RETURNING id
+    ''', (alan, title, url, description, tags)).fetchone()[0]
+    if changes is not None:
+        conn.executemany(*changes([("resources", resource_id)]))
+    return resource_id
+
+
+def _delete(conn, resource_id, changes):
+    deleted = conn.execute('DELETE FROM resources WHERE id = ?', (resource_id,)).rowcount
+    if deleted and changes is not None:
+        conn.executemany(*changes([("resources", resource_id)]))
+    return deleted > 0
+
+
+class ResourceCatalog:
+    def __init__(self, db, feed=None, cache_size=CACHE_SIZE):
+        self.db = db
+        self.cache_size = cache_size
+        self._changes = feed.batch if feed is not None else None
+        self._cache = OrderedDict()  # sorgu anahtarı -> [Resource]
+        self.alanlar = set()
+        if feed is not None:
+            feed.on("resources", self._catalog_changed)
+
+    async def load(self):
+        rows = await self.db.fetchall('SELECT DISTINCT alan FROM resources')
+        self.alanlar = {row['alan'] for row in rows}
+        return len(self.alanlar)
+
+    async def _catalog_changed(self, resource_ids):
+        self._cache.clear()
+        await self.load()
+
+    async def _cached(self, key, sql, params):
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+            return result
+        result = [Resource(row) for row in await self.db.fetchall(sql, params)]
+        self._cache[key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    async def by_alan(self, alan, limit=DEFAULT_LIMIT):
+        return await self._cached(("alan", alan, limit), '''
+            SELECT * FROM resources WHERE alan = ? ORDER BY weight DESC, id LIMIT ?
+        ''', (alan, limit))
+
+    async def search(self, text, limit=DEFAULT_LIMIT):
+        query = _fts_query(text)
+        if not query:
+            return []
+        return await self._cached(("ara", query, limit), '''
+            SELECT r.* FROM resources_fts JOIN resources r ON r.id = resources_fts.rowid
+            WHERE resources_fts MATCH ? ORDER BY bm25(resources_fts, 5.0, 1.0, 3.0), r.weight DESC LIMIT ?
+        ''', (query, limit))
+
+    async def recommend(self, sonuc, limit=DEFAULT_LIMIT):
+        """Quiz sonucuna göre: önce alan eşleşmesi, sonra meslek/dil kelimeleriyle uygunluk"""
+        alan = sonuc.get("alan") or ""
+        query = _fts_query(" ".join(filter(None, (alan, sonuc.get("meslek"), sonuc.get("dil")))), " OR ")
+        if not query:
+            return await self.by_alan(alan, limit) if alan else []
+        return await self._cached(("oneri", alan, query, limit), '''
+            SELECT r.* FROM resources r
+            LEFT JOIN (
+                SELECT rowid, bm25(resources_fts, 5.0, 1.0, 3.0) AS rank FROM resources_fts WHERE resources_fts MATCH ?
+            ) m ON m.rowid = r.id
+            WHERE r.alan = ? OR m.rowid IS NOT NULL
+            ORDER BY r.alan = ? DESC, COALESCE(m.rank, 0), r.weight DESC, r.id LIMIT ?
+        ''', (query, alan, alan, limit))
+
+    async def add(self, alan, title, url, description="", tags=""):
+        resource_id = await self.db.write(_insert, alan, title, url, description, tags, self._changes)
+        self._cache.clear()
+        self.alanlar.add(alan)
+        return resource_id
+
+    async def remove(self, resource_id):
+        removed = await self.db.write(_delete, resource_id, self._changes)
+        if removed:
+            self._cache.clear()
+            await self.load()
+        return removed
@@ -0,0 +1,108 @@
+"""Sunucu bazlı rol önbelleği.
+
+Her sunucu için rol adı -> rol indeksi ilk ihtiyaçta bir kez kurulur ve rol
+oluşturma/güncelleme/silme olaylarıyla güncel tutulur; böylece her quiz
+sonunda guild.roles taranmaz. Aynı rolün eşzamanlı oluşturulma istekleri tek
+bir create_role çağrısında birleştirilir. Rol verme istekleri kısa bir süre
+biriktirilip üye başına tek add_roles çağrısıyla uygulanır.
+"""
+import asyncio
+
+GRANT_DELAY = 0.5  # saniye; bu süre içinde gelen rol istekleri birleştirilir
+
+
+class RoleCache:
+    def __init__(self, grant_delay=GRANT_DELAY):
+        self.grant_delay = grant_delay
+        self._names = {}     # guild_id -> {rol adı: rol}
+        self._creating = {}  # (guild_id, rol adı) -> asyncio.Task
+        self._grants = {}    # (guild_id, member_id) -> (member, {rol})
+        self._tasks = set()
+
+    def _index(self, guild):
+        names = self._names.get(guild.id)
+        if names is None:
+            names = {}
+            for role in guild.roles:
+                # discord.utils.get gibi aynı adlı rollerden ilki kullanılır
+                names.setdefault(role.name, role)
+            self._names[guild.id] = names
+        return names
+
+    def get(self, guild, name):
+        return self._index(guild).get(name)
+
+    # --- olaylar ---
+    def role_created(self, role):
+        names = self._names.get(role.guild.id)
+        if names is not None:
+            names.setdefault(role.name, role)
+
+    def role_updated(self, before, after):
+        names = self._names.get(after.guild.id)
+        if names is None:
+            return
+        if before.name != after.name:
+            self._drop(names, after.guild, before.name, before.id)
+        if names.get(after.name) is None or names[after.name].id == after.id:
+            names[after.name] = after
+
+    def role_deleted(self, role):
+        names = self._names.get(role.guild.id)
+        if names is not None:
+            self._drop(names, role.guild, role.name, role.id)
+
+    def _drop(self, names, guild, name, role_id):
+        current = names.get(name)
+        if current is None or current.id != role_id:
+            return
+        del names[name]
+        # Aynı adda başka bir rol varsa onu kullan
+        for role in guild.roles:
+            if role.name == name and role.id != role_id:
+                names[name] = role
+                break
+
+    def forget_guild(self, guild):
+        self._names.pop(guild.id, None)
+
+    # --- oluşturma ---
+    async def get_or_create(self, guild, name):
+        role = self.get(guild, name)
+        if role is not None:
+            return role
+        key = (guild.id, name)
+        task = self._creating.get(key)
+        if task is None:
+            task = asyncio.create_task(self._create(guild, name))
+            self._creating[key] = task
+            task.add_done_callback(lambda t: self._creating.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _create(self, guild, name):
+        role = await guild.create_role(name=name)
+        self._index(guild).setdefault(name, role)
+        return role
+
+    # --- rol verme ---
+    def grant(self, member, role):
+        key = (member.guild.id, member.id)
+        pending = self._grants.get(key)
+        if pending is None:
+            self._grants[key] = (member, {role})
+            task = asyncio.create_task(self._flush_grant(key))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            pending[1].add(role)
+
+    async def _flush_grant(self, key):
+        await asyncio.sleep(self.grant_delay)
+        member, roles = self._grants.pop(key)
+        missing = [role for role in roles if role not in member.roles]
+        if not missing:
+            return
+        try:
+            await member.add_roles(*missing)
+        except Exception as e:
+            print(f"Rol verilemedi: {e}")
@@ -0,0 +1,124 @@
+"""Buton (component) etkileşimleri için custom_id yönlendirici.
+
+custom_id'ler "önek:parça:parça" biçimindedir (bkz. custom_id()). Handler'lar
+ya tam bir custom_id'ye ya da bir öneke kaydedilir; gelen etkileşim tek bir
+dict araması ile handler'ına gider ve önekten sonraki parçalar handler'a
+argüman olarak verilir:
+
+    @router.prefix("quiz")
+    async def quiz_cevap(interaction, kategori, soru_no, secim): ...
+
+defer=True ile kaydedilen handler'lar için etkileşim hemen defer() ile
+onaylanır ve handler arka plan iş kuyruğunda (jobs.JobQueue) çalışır; bu
+handler'lar cevaplarını interaction.followup ile gönderir. Aynı kullanıcının
+ertelenmiş etkileşimleri sırayla işlenir.
+
+Her handler için çağrı sayısı, toplam ve en uzun süre stats içinde tutulur;
+süreler ayrıca interaction_seconds histogramına, onaya kadar geçen süre
+interaction_ack_seconds histogramına yazılır.
+"""
+import time
+
+from jobs import QueueFull
+from metrics import metrics
+
+SEPARATOR = ":"
+
+
+def custom_id(prefix, *parts):
+    return SEPARATOR.join((prefix, *map(str, parts)))
+
+
+class Route:
+    __slots__ = ("name", "handler", "public", "defer")
+
+    def __init__(self, handler, public, defer=False):
+        self.name = handler.__name__
+        self.handler = handler
+        self.public = public
+        self.defer = defer
+
+
+class Router:
+    def __init__(self, jobs=None):
+        self._exact = {}   # custom_id -> Route
+        self._prefix = {}  # önek -> Route
+        self.guard = None  # async guard(interaction) -> bool; public olmayan handler'lar için
+        self.jobs = jobs   # defer=True handler'ların çalıştığı JobQueue
+        self.stats = {}    # handler adı -> [çağrı, toplam süre, en uzun süre]
+
+    def exact(self, *custom_ids, public=False, defer=False):
+        def deco(handler):
+            for cid in custom_ids:
+                self._exact[cid] = Route(handler, public, defer)
+            return handler
+        return deco
+
+    def prefix(self, name, public=False, defer=False):
+        def deco(handler):
+            self._prefix[name] = Route(handler, public, defer)
+            return handler
+        return deco
+
+    def resolve(self, cid):
+        route = self._exact.get(cid)
+        if route is not None:
+            return route, ()
+        head, sep, tail = cid.partition(SEPARATOR)
+        if sep:
+            route = self._prefix.get(head)
+            if route is not None:
+                return route, tail.split(SEPARATOR)
+        return None, ()
+
+    async def dispatch(self, interaction):
+        """Etkileşimi handler'ına iletir; handler bulunamazsa False döner"""
+        data = interaction.data
+        if not data or "custom_id" not in data:
+            return False
+        route, args = self.resolve(data["custom_id"])
+        if route is None:
+            return False
+        received = time.perf_counter()
+        if not route.public and self.guard is not None and not await self.guard(interaction):
+            return True
+        if route.defer and self.jobs is not None:
+            # Onay işten önce gider; followup'lar ancak onaydan sonra gönderilebilir
+            await interaction.response.defer()
+            metrics.observe("interaction_ack_seconds", time.perf_counter() - received, handler=route.name)
+            try:
+                self.jobs.submit(interaction.user.id, route.name, self._deferred, route, interaction, args)
+            except QueueFull:
+                metrics.inc("interaction_rejected_total", handler=route.name)
+                await interaction.followup.send("Sistem şu anda yoğun. Lütfen birkaç saniye sonra tekrar deneyin.",
+                                                ephemeral=True)
+            return True
+        await self._call(route, interaction, args)
+        # Handler cevabını kendi içinde verir; süre onay süresinin üst sınırıdır
+        metrics.observe("interaction_ack_seconds", time.perf_counter() - received, handler=route.name)
+        return True
+
+    async def _deferred(self, route, interaction, args):
+        try:
+            await self._call(route, interaction, args)
+        except Exception:
+            await interaction.followup.send("İşlem sırasında bir hata oluştu. Lütfen tekrar deneyin.", ephemeral=True)
+            raise
+
+    async def _call(self, route, interaction, args):
+        started = time.perf_counter()
+        try:
+            await route.handler(interaction, *args)
+        except Exception:
+            metrics.inc("interaction_errors_total", handler=route.name)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            metrics.observe("interaction_seconds", elapsed, handler=route.name)
+            stat = self.stats.get(route.name)
+            if stat is None:
+                stat = self.stats[route.name] = [0, 0.0, 0.0]
+            stat[0] += 1
+            stat[1] += elapsed
+            if elapsed > stat[2]:
+                stat[2] = elapsed
@@ -0,0 +1,134 @@
+"""Süreli ve bellek sınırlı oturum deposu.
+
+Oturumlar son kullanım sırasına göre bir OrderedDict'te tutulur; kontrol ve
+güncelleme O(1)'dir. Boşta kalma süresi dolanlar listenin başında biriktiği,
+mutlak süresi dolanlar da bir min-heap'te sıralandığı için temizlik yalnızca
+süresi dolmuş kayıtlara dokunur. MAX_SESSIONS aşılınca en uzun süredir
+kullanılmayan oturum atılır. Bir StateStore verilirse oturumlar state_kv'ye
+yazılır ve yeniden başlatmada geri yüklenir.
+"""
+import heapq
+import time
+from collections import OrderedDict
+
+SESSION_TTL = 24 * 3600       # girişten itibaren en fazla
+SESSION_IDLE = 2 * 3600       # son kullanımdan itibaren en fazla
+MAX_SESSIONS = 50000
+TOUCH_PERSIST_INTERVAL = 60   # last_seen en fazla bu sıklıkla diske yazılır
+
+
+class Session:
+    __slots__ = ("created", "last_seen", "saved_seen")
+
+    def __init__(self, created, last_seen):
+        self.created = created
+        self.last_seen = last_seen
+        self.saved_seen = last_seen
+
+
+def _encode(session):
+    return [session.created, session.last_seen]
+
+
+def _decode(value):
+    return Session(value[0], value[1])
+
+
+class SessionStore:
+    def __init__(self, ttl=SESSION_TTL, idle=SESSION_IDLE, max_sessions=MAX_SESSIONS,
+                 state=None, clock=time.time):
+        self.ttl = ttl
+        self.idle = idle
+        self.max_sessions = max_sessions
+        self.clock = clock
+        self._sessions = OrderedDict()  # user_id -> Session, en eski kullanım başta
+        self._expiry = []  # (created + ttl, user_id, created)
+        self._state = state
+        if state is not None:
+            state.register("sessions", self._sessions, encode=_encode, decode=_decode)
+            state.on_reload("sessions", self._reloaded)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _mark(self, user_id):
+        if self._state is not None:
+            self._state.mark_dirty("sessions", user_id)
+
+    def _drop(self, user_id):
+        del self._sessions[user_id]
+        self._mark(user_id)
+
+    def login(self, user_id):
+        now = self.clock()
+        self._sessions.pop(user_id, None)
+        self._sessions[user_id] = Session(now, now)
+        heapq.heappush(self._expiry, (now + self.ttl, user_id, now))
+        self._mark(user_id)
+        while len(self._sessions) > self.max_sessions:
+            oldest = next(iter(self._sessions))
+            self._drop(oldest)
+
+    def logout(self, user_id):
+        if user_id in self._sessions:
+            self._drop(user_id)
+            return True
+        return False
+
+    def is_active(self, user_id):
+        """Oturum geçerliyse son kullanım zamanını günceller"""
+        session = self._sessions.get(user_id)
+        if session is None:
+            return False
+        now = self.clock()
+        if now - session.created > self.ttl or now - session.last_seen > self.idle:
+            self._drop(user_id)
+            return False
+        session.last_seen = now
+        self._sessions.move_to_end(user_id)
+        if now - session.saved_seen > TOUCH_PERSIST_INTERVAL:
+            session.saved_seen = now
+            self._mark(user_id)
+        return True
+
+    def sweep(self):
+        """Süresi dolan oturumları siler; yalnızca dolmuş kayıtları gezer"""
+        now = self.clock()
+        removed = 0
+        while self._sessions:
+            user_id, session = next(iter(self._sessions.items()))
+            if now - session.last_seen <= self.idle:
+                break
+            self._drop(user_id)
+            removed += 1
+        while self._expiry and self._expiry[0][0] <= now:
+            _, user_id, created = heapq.heappop(self._expiry)
+            session = self._sessions.get(user_id)
+            # Heap kaydı eski bir girişe aitse atlanır (lazy deletion)
+            if session is not None and session.created == created:
+                self._drop(user_id)
+                removed += 1
+        # Çıkış yapılan oturumların heap kayıtları birikmesin
+        if len(self._expiry) > 2 * len(self._sessions) + 64:
+            self._rebuild_expiry()
+        return removed
+
+    def _rebuild_expiry(self):
+        self._expiry = [(s.created + self.ttl, uid, s.created) for uid, s in self._sessions.items()]
+        heapq.heapify(self._expiry)
+
+    def _reloaded(self, user_ids):
+        # Başka süreçte açılan/yenilenen oturumlar: sıraya ve süre heap'ine ekle
+        for user_id in user_ids:
+            session = self._sessions.get(user_id)
+            if session is not None:
+                self._sessions.move_to_end(user_id)
+                heapq.heappush(self._expiry, (session.created + self.ttl, user_id, session.created))
+
+    def restore(self):
+        """state.load() sonrasında sırayı ve süre heap'ini yeniden kurar"""
+        ordered = sorted(self._sessions.items(), key=lambda item: item[1].last_seen)
+        self._sessions.clear()
+        self._sessions.update(ordered)
+        self._rebuild_expiry()
+        return self.sweep()
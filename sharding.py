@@ -0,0 +1,138 @@
+"""Çok süreçli (sharded) çalışma.
+
+BOT_SHARDED=1 ile bot AutoShardedBot olarak açılır; BOT_SHARD_COUNT toplam
+shard sayısını, BOT_SHARD_IDS ("0,1") bu sürecin çalıştırdığı shard'ları
+belirler. Tüm süreçler aynı SQLite dosyasını (WAL) paylaşır.
+
+Her süreç durumu bellekte tutmaya devam eder. StateStore her flush'ta
+değişen (namespace, anahtar) çiftlerini aynı transaction içinde
+state_changes tablosuna da yazar. ChangeFeed bu tabloyu kısa aralıklarla
+okur ve diğer süreçlerin değiştirdiği anahtarları kayıtlı handler'lara
+verir; handler'lar yalnızca o anahtarları veritabanından yeniden yükler.
+Zamanlanmış işler (hatırlatmalar, mentor süresi) yalnızca birincil süreçte
+(shard 0'ı çalıştıran) yürür.
+
+Aynı makinedeki süreçler aynı metrik portunu açamaz; her süreç
+METRICS_PORT + ilk shard id'si portunu kullanır (BOT_SHARD_IDS="2,3" ise
+9108 + 2). Farklı bir düzen gerekiyorsa METRICS_PORT süreç başına verilir.
+"""
+import asyncio
+import os
+import socket
+import time
+
+from discord.ext import commands
+
+from metrics import METRICS_PORT, metrics
+
+SHARDED = os.environ.get("BOT_SHARDED", "0") == "1"
+SHARD_COUNT = int(os.environ.get("BOT_SHARD_COUNT", 0)) or None
+SHARD_IDS = [int(x) for x in os.environ.get("BOT_SHARD_IDS", "").split(",") if x.strip()] or None
+ORIGIN = f"{socket.gethostname()}:{os.getpid()}"
+POLL_INTERVAL = 1.0      # saniye
+RETENTION = 3600         # state_changes satırları bu kadar saniye tutulur
+POLL_LIMIT = 1000
+
+
+def check_config(shard_count=SHARD_COUNT, shard_ids=SHARD_IDS):
+    """Shard ortam değişkenlerini doğrular; hatalıysa açıklayıcı RuntimeError"""
+    if shard_ids is None:
+        return
+    if shard_count is None:
+        raise RuntimeError("BOT_SHARD_IDS verildiğinde BOT_SHARD_COUNT da verilmelidir "
+                           f"(BOT_SHARD_IDS={','.join(map(str, shard_ids))})")
+    invalid = [shard_id for shard_id in shard_ids if not 0 <= shard_id < shard_count]
+    if invalid:
+        raise RuntimeError(f"BOT_SHARD_IDS içindeki {invalid} BOT_SHARD_COUNT={shard_count} için geçersiz "
+                           f"(0..{shard_count - 1} olmalı)")
+
+
+def make_bot(**kwargs):
+    if not SHARDED:
+        return commands.Bot(**kwargs)
+    check_config()
+    return commands.AutoShardedBot(shard_count=SHARD_COUNT, shard_ids=SHARD_IDS, **kwargs)
+
+
+def is_primary():
+    """Tek süreçte ya da shard 0'ı çalıştıran süreçte True"""
+    return not SHARDED or SHARD_IDS is None or 0 in SHARD_IDS
+
+
+def metrics_port(base=METRICS_PORT):
+    """Bu sürecin metrik portu; 0 (kapalı) ise 0"""
+    if not base or not SHARDED or SHARD_IDS is None:
+        return base
+    return base + min(SHARD_IDS)
+
+
+def _prune(conn, before):
+    conn.execute('DELETE FROM state_changes WHERE ts < ?', (before,))
+
+
+class ChangeFeed:
+    def __init__(self, db, origin=ORIGIN, interval=POLL_INTERVAL, retention=RETENTION):
+        self.db = db
+        self.origin = origin
+        self.interval = interval
+        self.retention = retention
+        self._handlers = {}  # namespace -> [async handler(anahtarlar)]
+        self._last_id = 0
+        self._last_prune = 0.0
+        self._task = None
+
+    def on(self, namespace, handler):
+        self._handlers.setdefault(namespace, []).append(handler)
+
+    def batch(self, changes):
+        """StateStore flush'ına eklenecek (sql, satırlar) çifti"""
+        now = int(time.time())
+        rows = [(self.origin, namespace, key, now) for namespace, key in changes]
+        return ('INSERT INTO state_changes (origin, namespace, key, ts) VALUES (?, ?, ?, ?)', rows)
+
+    async def prime(self):
+        """state.load() öncesinde çağrılır: yükleme sonrası değişiklikler kaçmaz"""
+        row = await self.db.fetchone('SELECT COALESCE(MAX(id), 0) FROM state_changes')
+        self._last_id = row[0]
+
+    async def poll(self):
+        rows = await self.db.fetchall(
+            'SELECT id, namespace, key FROM state_changes WHERE id > ? AND origin != ? ORDER BY id LIMIT ?',
+            (self._last_id, self.origin, POLL_LIMIT))
+        if not rows:
+            return 0
+        self._last_id = rows[-1]['id']
+        changed = {}
+        for row in rows:
+            changed.setdefault(row['namespace'], set()).add(row['key'])
+        for namespace, keys in changed.items():
+            for handler in self._handlers.get(namespace, ()):
+                try:
+                    await handler(keys)
+                except Exception as e:
+                    print(f"Değişiklik uygulanamadı ({namespace}): {e}")
+        metrics.inc("state_changes_applied_total", len(rows))
+        return len(rows)
+
+    async def _run(self):
+        while True:
+            try:
+                # Limit dolduysa beklemeden devam et
+                while await self.poll() >= POLL_LIMIT:
+                    pass
+                now = time.time()
+                if is_primary() and now - self._last_prune > self.retention / 4:
+                    self._last_prune = now
+                    await self.db.write(_prune, int(now - self.retention))
+            except Exception as e:
+                print(f"Değişiklik akışı okunamadı: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
@@ -0,0 +1,191 @@
+"""SQLite erişim katmanı.
+
+Bağlantılar uzun ömürlüdür: tüm yazmalar tek bir yazıcı thread'inde sırayla
+(ve kuyrukta biriken işler tek transaction içinde) çalışır, okumalar küçük bir
+okuyucu havuzunda yapılır. Veritabanı WAL modunda açıldığı için okuyucular
+yazıcıyı beklemez. Her şey olay döngüsünden await edilerek kullanılır:
+
+    row = await db.fetchone('SELECT * FROM users WHERE username = ?', (ad,))
+    await db.execute('UPDATE users SET discord_id = ? WHERE username = ?', (uid, ad))
+"""
+import asyncio
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from metrics import metrics
+
+DB_PATH = os.environ.get("BOT_DB_PATH", "bot_users.db")
+READERS = int(os.environ.get("BOT_DB_READERS", 4))
+STATEMENT_CACHE = 256   # bağlantı başına hazırlanmış sorgu önbelleği
+WRITE_BATCH = 64        # tek transaction'da işlenecek en fazla yazma işi
+BUSY_TIMEOUT_MS = 5000
+
+
+def connect(path=DB_PATH, readonly=False):
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False,
+                           cached_statements=STATEMENT_CACHE)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    if readonly:
+        conn.execute("PRAGMA query_only = 1")
+    else:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+    return conn
+
+
+class Database:
+    def __init__(self, path=DB_PATH, readers=READERS):
+        self.path = path
+        self.readers = readers
+        self._writes = queue.Queue()
+        self._writer = None
+        self._reader_pool = None
+        self._local = threading.local()
+        self._reader_conns = []
+        self._lock = threading.Lock()
+
+    # --- yaşam döngüsü ---
+    def start(self):
+        with self._lock:
+            if self._writer is not None:
+                return
+            # WAL modu yazıcı bağlantısı açılırken ayarlanır; okuyuculardan önce açılmalı
+            ready = threading.Event()
+            self._writer = threading.Thread(target=self._writer_loop, args=(ready,),
+                                            name="db-writer", daemon=True)
+            self._writer.start()
+            ready.wait()
+            self._reader_pool = ThreadPoolExecutor(max_workers=self.readers,
+                                                   thread_name_prefix="db-reader")
+
+    def close(self):
+        with self._lock:
+            if self._writer is None:
+                return
+            self._writes.put(None)
+            self._writer.join()
+            self._writer = None
+            self._reader_pool.shutdown(wait=True)
+            self._reader_pool = None
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns.clear()
+            self._local = threading.local()
+
+    # --- yazıcı thread ---
+    def _writer_loop(self, ready):
+        conn = connect(self.path)
+        ready.set()
+        stop = False
+        while not stop:
+            job = self._writes.get()
+            if job is None:
+                break
+            batch = [job]
+            while len(batch) < WRITE_BATCH:
+                try:
+                    job = self._writes.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    stop = True
+                    break
+                batch.append(job)
+            self._run_batch(conn, batch)
+        conn.close()
+
+    def _run_batch(self, conn, batch):
+        # Kuyrukta biriken işler tek commit ile yazılır; her iş kendi
+        # savepoint'inde çalıştığı için hatalı bir iş diğerlerini geri almaz.
+        done = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for func, args, fut in batch:
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                conn.execute("SAVEPOINT job")
+                try:
+                    result = func(conn, *args)
+                except Exception as e:
+                    conn.execute("ROLLBACK TO job")
+                    conn.execute("RELEASE job")
+                    done.append((fut, None, e))
+                else:
+                    conn.execute("RELEASE job")
+                    done.append((fut, result, None))
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for func, args, fut in batch:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for fut, result, error in done:
+            if error is not None:
+                fut.set_exception(error)
+            else:
+                fut.set_result(result)
+
+    # --- okuyucu havuzu ---
+    def _reader_conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = connect(self.path, readonly=True)
+            self._local.conn = conn
+            self._reader_conns.append(conn)
+        return conn
+
+    def _read_job(self, func, args):
+        return func(self._reader_conn(), *args)
+
+    # --- await edilebilir API ---
+    async def write(self, func, *args):
+        """func(conn, *args) yazıcı thread'inde, transaction içinde çalışır"""
+        self.start()
+        fut = Future()
+        with metrics.timer("db_seconds", op="write", query=func.__name__):
+            self._writes.put((func, args, fut))
+            return await asyncio.wrap_future(fut)
+
+    async def read(self, func, *args):
+        """func(conn, *args) okuyucu havuzunda çalışır"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        with metrics.timer("db_seconds", op="read", query=func.__name__):
+            return await loop.run_in_executor(self._reader_pool, self._read_job, func, args)
+
+    async def execute(self, sql, params=()):
+        return await self.write(_execute, sql, params)
+
+    async def executemany(self, sql, seq):
+        return await self.write(_executemany, sql, seq)
+
+    async def fetchone(self, sql, params=()):
+        return await self.read(_fetchone, sql, params)
+
+    async def fetchall(self, sql, params=()):
+        return await self.read(_fetchall, sql, params)
+
+
+def _execute(conn, sql, params):
+    return conn.execute(sql, params)
+
+
+def _executemany(conn, sql, seq):
+    return conn.executemany(sql, seq)
+
+
+def _fetchone(conn, sql, params):
+    return conn.execute(sql, params).fetchone()
+
+
+def _fetchall(conn, sql, params):
+    return conn.execute(sql, params).fetchall()
+
+
+db = Database()
@@ -0,0 +1,143 @@
+"""Toplu kullanıcı içe/dışa aktarma.
+
+İçe aktarma CSV'yi satır satır okur (başlık: username,password,email,discord_id;
+email ve discord_id boş olabilir). Her BATCH_SIZE satırlık parça için zaten
+kayıtlı kullanıcı adları atlanır, kalan şifreler main.hash_password ile süreç
+havuzunda paralel hash'lenir ve parça tek transaction'da executemany ile
+yazılır. Dışa aktarma kullanıcıları ve quiz sonuçlarını imleçten parça parça
+okuyarak yazar; bellek kullanımı kullanıcı sayısından bağımsızdır.
+
+    python users_cli.py import ogrenciler.csv
+    python users_cli.py export kullanicilar.csv   (- : standart çıktı)
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import migrations
+from main import hash_password
+from storage import DB_PATH, connect
+
+BATCH_SIZE = 500
+EXPORT_FETCH = 1000
+EXPORT_COLUMNS = ("username", "email", "discord_id", "quiz_results", "created_at")
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _parse(row, line):
+    username = (row.get("username") or "").strip()
+    password = row.get("password") or ""
+    # RegisterModal ile aynı kurallar
+    if len(username) < 3 or len(password) < 4:
+        raise ValueError(f"{line}. satır: kullanıcı adı en az 3, şifre en az 4 karakter olmalı")
+    discord_id = (row.get("discord_id") or "").strip()
+    return username, password, (row.get("email") or "").strip() or None, int(discord_id) if discord_id else None
+
+
+def _existing(conn, usernames):
+    placeholders = ",".join("?" * len(usernames))
+    return {row[0] for row in conn.execute(f'SELECT username FROM users WHERE username IN ({placeholders})', usernames)}
+
+
+def import_users(path, db_path=DB_PATH, workers=None, batch_size=BATCH_SIZE):
+    conn = connect(db_path)
+    conn.execute("BEGIN IMMEDIATE")
+    migrations.migrate(conn)
+    conn.execute("COMMIT")
+    workers = workers or os.cpu_count() or 1
+    inserted = skipped = errors = 0
+    started = time.perf_counter()
+    with open(path, newline="", encoding="utf-8-sig") as f, ProcessPoolExecutor(max_workers=workers) as pool:
+        reader = csv.DictReader(f)
+        for chunk in _chunks(enumerate(reader, start=2), batch_size):
+            users = {}
+            for line, row in chunk:
+                try:
+                    user = _parse(row, line)
+                except ValueError as e:
+                    print(e, file=sys.stderr)
+                    errors += 1
+                    continue
+                if user[0] in users:
+                    skipped += 1
+                    continue
+                users[user[0]] = user
+            existing = _existing(conn, list(users)) if users else set()
+            skipped += len(existing)
+            todo = [user for name, user in users.items() if name not in existing]
+            hashes = pool.map(hash_password, [user[1] for user in todo],
+                              chunksize=max(1, len(todo) // (4 * workers)))
+            rows = [(name, hashed, email, discord_id)
+                    for (name, password, email, discord_id), hashed in zip(todo, hashes)]
+            before = conn.total_changes
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # discord_id başka bir kayda bağlıysa satır atlanır (benzersiz indeks)
+                conn.executemany('INSERT OR IGNORE INTO users (username, password, email, discord_id) VALUES (?, ?, ?, ?)', rows)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            added = conn.total_changes - before
+            inserted += added
+            skipped += len(rows) - added
+            print(f"{inserted} kullanıcı eklendi, {skipped} atlandı, {errors} hatalı "
+                  f"({time.perf_counter() - started:.1f} s)", file=sys.stderr)
+    conn.close()
+    return inserted, skipped, errors
+
+
+def export_users(path, db_path=DB_PATH):
+    conn = connect(db_path, readonly=True)
+    out = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+    count = 0
+    try:
+        writer = csv.writer(out)
+        writer.writerow(EXPORT_COLUMNS)
+        cursor = conn.execute(f'SELECT {", ".join(EXPORT_COLUMNS)} FROM users ORDER BY id')
+        while True:
+            rows = cursor.fetchmany(EXPORT_FETCH)
+            if not rows:
+                break
+            writer.writerows(tuple(row) for row in rows)
+            count += len(rows)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        conn.close()
+    print(f"{count} kullanıcı dışa aktarıldı.", file=sys.stderr)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Toplu kullanıcı içe/dışa aktarma")
+    parser.add_argument("--db", default=DB_PATH, help="veritabanı dosyası")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_import = sub.add_parser("import", help="CSV'den kullanıcı ekle")
+    p_import.add_argument("csv")
+    p_import.add_argument("--workers", type=int, default=os.cpu_count())
+    p_import.add_argument("--batch", type=int, default=BATCH_SIZE)
+    p_export = sub.add_parser("export", help="kullanıcıları ve quiz sonuçlarını CSV'ye yaz")
+    p_export.add_argument("csv")
+    args = parser.parse_args(argv)
+    if args.command == "import":
+        import_users(args.csv, args.db, args.workers, args.batch)
+    else:
+        export_users(args.csv, args.db)
+
+
+if __name__ == "__main__":
+    main()